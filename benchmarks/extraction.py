@@ -0,0 +1,97 @@
+"""Микробенчмарки извлечения данных со страниц.
+
+Сравнивает строковые CSS-селекторы и регулярные выражения, создаваемые в
+цикле, со скомпилированными из модуля patterns. Запуск из корня проекта:
+
+    PYTHONPATH=src python benchmarks/extraction.py
+"""
+import re
+import timeit
+
+from bs4 import BeautifulSoup
+
+import pages
+import patterns
+from utils import find_next_sibling, find_tag, find_tag_by_string
+
+REPEAT = 5
+NUMBER = 200
+
+
+def pep_status_inline(soup: BeautifulSoup) -> str:
+    return find_tag(
+        find_tag(
+            soup, string=re.compile('Status'), find_type=find_tag_by_string
+        ),
+        find_type=find_next_sibling
+    ).text
+
+
+def pep_status_compiled(soup: BeautifulSoup) -> str:
+    return find_tag(
+        find_tag(
+            soup,
+            string=patterns.PEP_STATUS_FIELD,
+            find_type=find_tag_by_string
+        ),
+        find_type=find_next_sibling
+    ).text
+
+
+def pep_rows_inline(soup: BeautifulSoup) -> list:
+    return soup.select('#numerical-index table.pep-zero-table tbody tr')
+
+
+def pep_rows_compiled(soup: BeautifulSoup) -> list:
+    return patterns.PEP_ROWS.select(soup)
+
+
+def whats_new_links_inline(soup: BeautifulSoup) -> list:
+    return soup.select(
+        '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > '
+        'a[href!="changelog.html"]'
+    )
+
+
+def whats_new_links_compiled(soup: BeautifulSoup) -> list:
+    return patterns.WHATS_NEW_LINKS.select(soup)
+
+
+CASES = (
+    ('Статус на странице PEP', pages.pep_page(),
+     pep_status_inline, pep_status_compiled),
+    ('Строки таблицы PEP 0', pages.pep_index(),
+     pep_rows_inline, pep_rows_compiled),
+    ('Ссылки на статьи What’s New', pages.whats_new_index(),
+     whats_new_links_inline, whats_new_links_compiled),
+)
+
+
+def measure(function, soup: BeautifulSoup, number: int) -> float:
+    """Возвращает лучшее время одного вызова функции в микросекундах."""
+    return min(timeit.repeat(
+        lambda: function(soup), repeat=REPEAT, number=number
+    )) / number * 10 ** 6
+
+
+def main() -> None:
+    for title, page, inline, compiled in CASES:
+        soup = BeautifulSoup(page, features='lxml')
+        assert inline(soup) == compiled(soup), title
+        number = NUMBER if len(page) < 100_000 else NUMBER // 20
+        inline_time = measure(inline, soup, number)
+        compiled_time = measure(compiled, soup, number)
+        print(
+            f'{title}: строкой {inline_time:.1f} мкс, '
+            f'скомпилированный {compiled_time:.1f} мкс '
+            f'(x{inline_time / compiled_time:.2f})'
+        )
+    parse_time = min(timeit.repeat(
+        lambda: BeautifulSoup(pages.pep_page(), features='lxml'),
+        repeat=REPEAT, number=NUMBER // 10
+    )) / (NUMBER // 10) * 10 ** 6
+    print(f'Разбор страницы PEP (BeautifulSoup + lxml): {parse_time:.1f} мкс')
+
+
+if __name__ == '__main__':
+    main()
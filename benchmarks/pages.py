@@ -0,0 +1,65 @@
+"""Синтетические страницы, повторяющие разметку документации Python и PEP.
+
+Используются в бенчмарках, чтобы измерения не зависели от сети.
+"""
+PEP_STATUSES = ('Active', 'Final', 'Rejected', 'Draft', 'Withdrawn')
+
+
+def whats_new_index(versions: int = 20) -> str:
+    """Страница со списком статей о нововведениях."""
+    items = ''.join(
+        f'<li class="toctree-l1"><a class="reference internal" '
+        f'href="3.{number}.html">What’s New In Python 3.{number}</a>'
+        f'<ul><li class="toctree-l2"><a href="3.{number}.html#summary">'
+        'Summary</a></li></ul></li>'
+        for number in range(versions, 0, -1)
+    )
+    return (
+        '<html><body><section id="what-s-new-in-python"><h1>What’s New</h1>'
+        '<div class="toctree-wrapper compound"><ul>'
+        f'{items}<li class="toctree-l1"><a href="changelog.html">'
+        'Changelog</a></li></ul></div></section></body></html>'
+    )
+
+
+def whats_new_article(number: int = 12, paragraphs: int = 200) -> str:
+    """Статья о нововведениях в версии Python."""
+    body = '<p>Lorem ipsum dolor sit amet.</p>' * paragraphs
+    return (
+        f'<html><body><section><h1>What’s New In Python 3.{number}'
+        '<a class="headerlink">¶</a></h1><dl class="field-list simple">'
+        '<dt>Editor<span class="colon">:</span></dt>'
+        f'<dd><p>Editor {number}</p>\n</dd></dl>{body}</section>'
+        '</body></html>'
+    )
+
+
+def pep_index(peps: int = 700) -> str:
+    """Страница PEP 0 с таблицей всех документов."""
+    rows = ''.join(
+        '<tr class="row-odd"><td><abbr title="Standards Track, '
+        f'{PEP_STATUSES[number % 5]}">S{PEP_STATUSES[number % 5][0]}</abbr>'
+        f'</td><td><a class="pep reference internal" '
+        f'href="pep-{number:04d}/">{number}</a></td><td><a class="pep '
+        f'reference internal" href="pep-{number:04d}/">PEP {number}</a>'
+        '</td><td>Author</td></tr>'
+        for number in range(1, peps + 1)
+    )
+    return (
+        '<html><body><section id="numerical-index"><table '
+        'class="pep-zero-table docutils"><thead><tr><th>PEP</th></tr>'
+        f'</thead><tbody>{rows}</tbody></table></section></body></html>'
+    )
+
+
+def pep_page(number: int = 8, paragraphs: int = 200) -> str:
+    """Страница документа PEP."""
+    body = '<p>Lorem ipsum dolor sit amet.</p>' * paragraphs
+    return (
+        '<html><body><section><dl class="rfc2822 field-list simple">'
+        '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+        '<dd class="field-odd">Author</dd><dt class="field-even">Status'
+        '<span class="colon">:</span></dt><dd class="field-even">'
+        f'<abbr title="status">{PEP_STATUSES[number % 5]}</abbr></dd></dl>'
+        f'{body}</section></body></html>'
+    )
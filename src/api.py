@@ -0,0 +1,204 @@
+"""Программный интерфейс парсера для встраивания в другие приложения.
+
+Функции отдают записи по мере обработки страниц и не требуют настройки
+командной строки: импорт модуля не настраивает логирование, не создаёт
+файлов и не загружает HTTP-библиотеки. Если сессия не передана, функция
+создаёт обычную сессию requests без кеша на диске; журнал контрольных
+точек, индикатор прогресса и вывод результатов не используются.
+
+Режимы работы парсера построены на этих же функциях: они передают
+собственную функцию обхода страниц (параметр crawl) с ограничением обхода,
+журналом контрольных точек и индикатором прогресса.
+
+Пример:
+    from api import iter_pep_statuses
+
+    mismatched = [pep for pep in iter_pep_statuses() if not pep.matched]
+"""
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+from urllib.parse import urljoin
+
+from constants import (
+    DEFAULT_PARSER,
+    EXPECTED_STATUS,
+    MAIN_DOC_URL,
+    PEP_URL,
+    PIPELINE_FETCH_WORKERS,
+    WHATS_NEW_URL_POSTFIX
+)
+from utils import get_document
+
+if TYPE_CHECKING:
+    from requests import Session
+
+Crawl = Callable[
+    [Any, Any, List[Tuple[str, Any]], str, Callable[[str, Any, Any], Any]],
+    Iterator[Any]
+]
+
+
+class WhatsNewArticle(NamedTuple):
+    """Статья о нововведениях версии Python."""
+
+    url: str
+    title: str
+    editors: str
+
+
+class PythonVersion(NamedTuple):
+    """Версия Python со ссылкой на документацию."""
+
+    url: str
+    version: str
+    status: str
+
+
+class PepStatus(NamedTuple):
+    """Статус документа PEP в таблице PEP 0 и в карточке документа."""
+
+    number: int
+    title: str
+    type: str
+    url: str
+    index_status: str
+    page_status: str
+
+    @property
+    def matched(self) -> bool:
+        """Совпадает ли статус в карточке с ожидаемым по таблице PEP 0."""
+        return self.page_status in EXPECTED_STATUS.get(self.index_status, ())
+
+
+def default_session(session: Optional[Session]) -> Any:
+    """Возвращает переданную сессию или создаёт сессию requests."""
+    if session is not None:
+        return session
+    from requests import Session
+
+    return Session()
+
+
+def default_crawl(workers: int) -> Crawl:
+    """Возвращает функцию обхода страниц конвейером без журнала
+    контрольных точек и без сохранения кеша извлечения на диск.
+
+    Параметры:
+        workers: Число потоков загрузки страниц.
+    """
+    def crawl(
+        session: Any,
+        parser: Any,
+        tasks: List[Tuple[str, Any]],
+        method: str,
+        build: Callable[[str, Any, Any], Any]
+    ) -> Iterator[Any]:
+        from memo import get_extraction_cache
+        from pipeline import crawl_pages
+
+        return crawl_pages(
+            session, parser, tasks, method, build, workers,
+            get_extraction_cache(False)
+        )
+
+    return crawl
+
+
+def iter_whats_new(
+    session: Optional[Session] = None,
+    workers: int = PIPELINE_FETCH_WORKERS,
+    parser: str = DEFAULT_PARSER,
+    crawl: Optional[Crawl] = None
+) -> Iterator[WhatsNewArticle]:
+    """Отдаёт статьи о нововведениях в версиях Python.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        workers: Число потоков загрузки страниц.
+        parser: Имя парсера HTML страниц.
+        crawl: Функция обхода страниц: получает сессию, парсер, список
+            пар из url и контекста, имя метода извлечения и функцию сборки
+            записи. По умолчанию - конвейер с workers потоками загрузки.
+    """
+    from parsers import create_parser
+
+    session = default_session(session)
+    html_parser = create_parser(parser)
+    whats_new_url = urljoin(MAIN_DOC_URL, WHATS_NEW_URL_POSTFIX)
+    links = html_parser.whats_new_links(
+        get_document(session, whats_new_url, html_parser)
+    )
+    yield from (crawl or default_crawl(workers))(
+        session,
+        html_parser,
+        [(urljoin(whats_new_url, href), None) for href in links],
+        'whats_new_article',
+        lambda url, _, article: WhatsNewArticle(url, *article)
+    )
+
+
+def iter_latest_versions(
+    session: Optional[Session] = None,
+    parser: str = DEFAULT_PARSER
+) -> Iterator[PythonVersion]:
+    """Отдаёт версии Python и их статусы.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        parser: Имя парсера HTML страниц.
+    """
+    from parsers import create_parser
+    from patterns import VERSION_STATUS
+
+    session = default_session(session)
+    html_parser = create_parser(parser)
+    for link, text in html_parser.python_versions(
+        get_document(session, MAIN_DOC_URL, html_parser)
+    ):
+        text_match = VERSION_STATUS.search(text)
+        if text_match is not None:
+            yield PythonVersion(link, *text_match.groups())
+        else:
+            yield PythonVersion(link, text, '')
+
+
+def iter_pep_statuses(
+    session: Optional[Session] = None,
+    workers: int = PIPELINE_FETCH_WORKERS,
+    parser: str = DEFAULT_PARSER,
+    crawl: Optional[Crawl] = None
+) -> Iterator[PepStatus]:
+    """Отдаёт статусы документов PEP в порядке таблицы PEP 0.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        workers: Число потоков загрузки страниц.
+        parser: Имя парсера HTML страниц.
+        crawl: Функция обхода страниц, как в iter_whats_new. Контекст
+            каждой страницы - строка таблицы PEP 0 (parsers.PepRow).
+    """
+    from parsers import create_parser
+
+    session = default_session(session)
+    html_parser = create_parser(parser)
+    rows = html_parser.pep_rows(get_document(session, PEP_URL, html_parser))
+    yield from (crawl or default_crawl(workers))(
+        session,
+        html_parser,
+        [(urljoin(PEP_URL, row.href), row) for row in rows],
+        'pep_status',
+        lambda url, row, status: PepStatus(
+            int(row.number), row.title, row.abbr[:1], url, row.abbr[1:],
+            status
+        )
+    )
@@ -0,0 +1,245 @@
+"""Хранилище архивов документации с адресацией по содержимому.
+
+Архивы хранятся в downloads/objects под именем, равным хешу SHA-256
+содержимого, поэтому одинаковые архивы не дублируются, а прошлые версии
+сохраняются. Манифест downloads/manifest.json хранит историю версий
+каждого архива с валидаторами ETag и Content-Length, а ссылка
+downloads/<имя архива> указывает на последнюю версию. Перед загрузкой
+валидаторы проверяются запросом HEAD: неизменившийся архив не
+загружается.
+
+С опцией --extract архив распаковывается в downloads/<имя архива без
+расширения> несколькими потоками: каждый поток открывает архив отдельно и
+распаковывает свои файлы потоком, проверяя их контрольные суммы CRC.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from constants import (
+    ARCHIVE_MANIFEST_FILE,
+    ARCHIVE_OBJECTS_DIR,
+    BASE_DIR,
+    DOWNLOADS_DIR,
+    EXTRACT_CHUNK_SIZE,
+    TEMP_FILE_SUFFIX
+)
+from utils import get_response
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+Validators = Tuple[Optional[str], Optional[str]]
+
+ARCHIVE_NOT_CHANGED = (
+    'Архив {archive_url} не изменился, загрузка пропущена: {archive_path}'
+)
+SUCCESS_ARCHIVE_DOWNLOAD = (
+    'Архив был загружен и сохранён: {archive_path}'
+)
+SUCCESS_ARCHIVE_EXTRACTED = (
+    'Архив {archive_path} проверен и распакован в {destination}: '
+    'файлов {count}, {size:.1f} МБ за {elapsed:.2f} с ({throughput:.1f} МБ/с)'
+)
+
+
+def load_manifest(downloads_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Возвращает историю версий архивов из манифеста."""
+    try:
+        with open(
+            downloads_dir / ARCHIVE_MANIFEST_FILE, encoding='utf-8'
+        ) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return {}
+
+
+def replace_file(file_path: Path, write: Callable[[Path], Any]) -> None:
+    """Атомарно создаёт или заменяет файл.
+
+    Параметры:
+        file_path: Путь к файлу.
+        write: Функция, создающая файл по переданному временному пути.
+    """
+    temp_path = file_path.with_name(f'.{file_path.name}{TEMP_FILE_SUFFIX}')
+    if temp_path.is_symlink() or temp_path.exists():
+        temp_path.unlink()
+    write(temp_path)
+    os.replace(temp_path, file_path)
+
+
+def save_manifest(
+    downloads_dir: Path,
+    manifest: Dict[str, List[Dict[str, Any]]]
+) -> None:
+    """Сохраняет манифест архивов."""
+    def write(temp_path: Path) -> None:
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+
+    replace_file(downloads_dir / ARCHIVE_MANIFEST_FILE, write)
+
+
+def link_latest(latest_path: Path, object_path: Path) -> None:
+    """Направляет ссылку на последнюю версию архива.
+    Если символические ссылки недоступны, архив копируется.
+    """
+    def write(temp_path: Path) -> None:
+        try:
+            temp_path.symlink_to(object_path.relative_to(latest_path.parent))
+        except OSError:
+            shutil.copyfile(object_path, temp_path)
+
+    replace_file(latest_path, write)
+
+
+def response_validators(response: Any) -> Validators:
+    """Возвращает заголовки ETag и Content-Length ответа."""
+    return (
+        response.headers.get('ETag'),
+        response.headers.get('Content-Length')
+    )
+
+
+def is_unchanged(
+    versions: List[Dict[str, Any]],
+    validators: Validators,
+    downloads_dir: Path
+) -> bool:
+    """Проверяет, совпадают ли валидаторы с последней версией архива."""
+    if not versions or validators == (None, None):
+        return False
+    latest = versions[-1]
+    return (
+        (latest['etag'], latest['content_length']) == validators
+        and (downloads_dir / latest['path']).exists()
+    )
+
+
+def update_archive(session: CachedSession, archive_url: str) -> Path:
+    """Загружает архив, если он изменился, и возвращает путь к ссылке на
+    его последнюю версию.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        archive_url: Адрес архива.
+    """
+    downloads_dir = BASE_DIR / DOWNLOADS_DIR
+    objects_dir = downloads_dir / ARCHIVE_OBJECTS_DIR
+    objects_dir.mkdir(parents=True, exist_ok=True)
+    archive_name = archive_url.split('/')[-1]
+    latest_path = downloads_dir / archive_name
+    manifest = load_manifest(downloads_dir)
+    versions = manifest.setdefault(archive_name, [])
+    validators = response_validators(get_response(
+        session, archive_url, method='HEAD', force_refresh=True
+    ))
+    if is_unchanged(versions, validators, downloads_dir):
+        logging.info(ARCHIVE_NOT_CHANGED.format(
+            archive_url=archive_url, archive_path=latest_path
+        ))
+        return latest_path
+    content = get_response(session, archive_url, force_refresh=True).content
+    digest = hashlib.sha256(content).hexdigest()
+    object_path = objects_dir / f'{digest}{Path(archive_name).suffix}'
+    if not object_path.exists():
+        replace_file(object_path, lambda temp_path: temp_path.write_bytes(
+            content
+        ))
+    if not versions or versions[-1]['sha256'] != digest:
+        versions.append({'sha256': digest})
+    versions[-1].update(
+        url=archive_url,
+        path=str(object_path.relative_to(downloads_dir)),
+        size=len(content),
+        etag=validators[0],
+        content_length=validators[1],
+        checked_at=dt.datetime.now().isoformat(timespec='seconds')
+    )
+    link_latest(latest_path, object_path)
+    save_manifest(downloads_dir, manifest)
+    logging.info(SUCCESS_ARCHIVE_DOWNLOAD.format(archive_path=latest_path))
+    return latest_path
+
+
+def member_path(directory: Path, member: zipfile.ZipInfo) -> Path:
+    """Возвращает путь к файлу архива внутри директории распаковки.
+    Абсолютные пути и переходы в родительские директории отбрасываются.
+    """
+    parts = [
+        part for part in member.filename.replace('\\', '/').split('/')
+        if part not in ('', '.', '..')
+    ]
+    return directory.joinpath(*parts)
+
+
+def extract_archive(archive_path: Path, workers: int) -> Path:
+    """Проверяет контрольные суммы и распаковывает архив в несколько
+    потоков. Возвращает директорию с распакованными файлами.
+    Файлы распаковываются потоком во временную директорию, контрольные
+    суммы CRC проверяются при чтении. После проверки всех файлов временная
+    директория заменяет прежнюю.
+
+    Параметры:
+        archive_path: Путь к архиву.
+        workers: Число потоков распаковки.
+    """
+    destination = archive_path.with_suffix('')
+    temp_dir = destination.with_name(
+        f'.{destination.name}{TEMP_FILE_SUFFIX}'
+    )
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    start = time.perf_counter()
+    with zipfile.ZipFile(archive_path) as archive:
+        members = sorted(
+            (member for member in archive.infolist() if not member.is_dir()),
+            key=lambda member: member.file_size,
+            reverse=True
+        )
+    targets = {
+        member.filename: member_path(temp_dir, member) for member in members
+    }
+    for target in targets.values():
+        target.parent.mkdir(parents=True, exist_ok=True)
+    local = threading.local()
+    opened = []
+
+    def extract_member(member: zipfile.ZipInfo) -> None:
+        if not hasattr(local, 'archive'):
+            local.archive = zipfile.ZipFile(archive_path)
+            opened.append(local.archive)
+        with local.archive.open(member) as source, open(
+            targets[member.filename], 'wb'
+        ) as target:
+            shutil.copyfileobj(source, target, EXTRACT_CHUNK_SIZE)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(extract_member, members))
+    finally:
+        for archive in opened:
+            archive.close()
+    shutil.rmtree(destination, ignore_errors=True)
+    os.replace(temp_dir, destination)
+    elapsed = time.perf_counter() - start
+    size = sum(member.file_size for member in members) / 2 ** 20
+    logging.info(SUCCESS_ARCHIVE_EXTRACTED.format(
+        archive_path=archive_path,
+        destination=destination,
+        count=len(members),
+        size=size,
+        elapsed=elapsed,
+        throughput=size / elapsed if elapsed else 0
+    ))
+    return destination
@@ -0,0 +1,178 @@
+"""Калибровка парсеров HTML.
+
+Сравнивает доступные парсеры на страницах, которые используют режимы
+работы, и для каждого режима выбирает самый быстрый парсер, результаты
+которого совпадают с результатами парсера по умолчанию. Страницы берутся
+через сессию, поэтому после обычного запуска режимов они читаются из кеша.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from argparse import Namespace
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Tuple
+from urllib.parse import urljoin
+
+from constants import (
+    CALIBRATION_REPEAT,
+    CALIBRATION_SAMPLE_SIZE,
+    DEFAULT_PARSER,
+    DOWNLOAD_URL_POSTFIX,
+    MAIN_DOC_URL,
+    PEP_URL,
+    WHATS_NEW_URL_POSTFIX
+)
+from utils import get_response
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+Pages = List[Tuple[str, str]]
+
+CALIBRATION_TABLE_COLUMN_HEADERS = (
+    'Режим', 'Парсер', 'Время, мс', 'Результат'
+)
+PARSER_CHOSEN = 'выбран'
+PARSER_IDENTICAL = 'совпадает'
+PARSER_DIFFERENT = 'отличается'
+PARSER_FAILED = 'ошибка: {error}'
+CALIBRATION_SAVED = 'Выбранные парсеры сохранены: {mode_to_parser}'
+
+
+def whats_new_pages(session: CachedSession, reference: Any) -> Pages:
+    """Возвращает страницы режима whats-new для калибровки."""
+    whats_new_url = urljoin(MAIN_DOC_URL, WHATS_NEW_URL_POSTFIX)
+    index = get_response(session, whats_new_url).text
+    links = reference.whats_new_links(reference.parse(index))
+    return [('whats_new_links', index)] + [
+        (
+            'whats_new_article',
+            get_response(session, urljoin(whats_new_url, link)).text
+        )
+        for link in links[:CALIBRATION_SAMPLE_SIZE]
+    ]
+
+
+def latest_versions_pages(session: CachedSession, reference: Any) -> Pages:
+    """Возвращает страницы режима latest-versions для калибровки."""
+    return [('python_versions', get_response(session, MAIN_DOC_URL).text)]
+
+
+def download_pages(session: CachedSession, reference: Any) -> Pages:
+    """Возвращает страницы режима download для калибровки."""
+    downloads_url = urljoin(MAIN_DOC_URL, DOWNLOAD_URL_POSTFIX)
+    return [('pdf_a4_link', get_response(session, downloads_url).text)]
+
+
+def pep_pages(session: CachedSession, reference: Any) -> Pages:
+    """Возвращает страницы режима pep для калибровки."""
+    index = get_response(session, PEP_URL).text
+    rows = reference.pep_rows(reference.parse(index))
+    return [('pep_rows', index)] + [
+        (
+            'pep_status',
+            get_response(session, urljoin(PEP_URL, row.href)).text
+        )
+        for row in rows[:CALIBRATION_SAMPLE_SIZE]
+    ]
+
+
+MODE_TO_PAGES = {
+    'whats-new': whats_new_pages,
+    'latest-versions': latest_versions_pages,
+    'download': download_pages,
+    'pep': pep_pages,
+}
+
+
+def extract(parser: Any, pages: Pages) -> List[Any]:
+    """Разбирает страницы парсером и извлекает из них данные.
+
+    Параметры:
+        parser: Парсер из модуля parsers.
+        pages: Пары из имени метода извлечения и HTML страницы.
+    """
+    return [
+        getattr(parser, method)(parser.parse(html)) for method, html in pages
+    ]
+
+
+def measure(function: Callable[[], Any]) -> float:
+    """Возвращает лучшее время выполнения функции в миллисекундах."""
+    best = float('inf')
+    for _ in range(CALIBRATION_REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def calibrate_mode(
+    reference: Any,
+    parsers: List[Any],
+    pages: Pages
+) -> Tuple[str, List[Tuple[str, float, str]]]:
+    """Сравнивает парсеры на страницах одного режима.
+    Возвращает имя выбранного парсера и результаты замеров.
+
+    Параметры:
+        reference: Парсер по умолчанию, с которым сравниваются результаты.
+        parsers: Доступные парсеры.
+        pages: Страницы режима.
+    """
+    expected = extract(reference, pages)
+    measurements = []
+    for parser in parsers:
+        try:
+            got = extract(parser, pages)
+        except Exception as error:
+            measurements.append(
+                (parser.name, None, PARSER_FAILED.format(error=error))
+            )
+            continue
+        verdict = PARSER_IDENTICAL if got == expected else PARSER_DIFFERENT
+        measurements.append((
+            parser.name, measure(lambda: extract(parser, pages)), verdict
+        ))
+    chosen = min(
+        (
+            measurement for measurement in measurements
+            if measurement[2] == PARSER_IDENTICAL
+        ),
+        key=lambda measurement: measurement[1]
+    )[0]
+    return chosen, measurements
+
+
+def calibrate(
+    session: CachedSession,
+    cli_args: Namespace
+) -> Iterator[Tuple[str, ...]]:
+    """Выбирает самый быстрый парсер для каждого режима работы.
+    Выбор сохраняется и используется режимами, если парсер не указан явно
+    (--parser auto).
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    from parsers import available_parsers, create_parser, save_calibration
+
+    reference = create_parser(DEFAULT_PARSER)
+    parsers = available_parsers()
+    mode_to_parser = {}
+    yield CALIBRATION_TABLE_COLUMN_HEADERS
+    for mode, get_pages in MODE_TO_PAGES.items():
+        chosen, measurements = calibrate_mode(
+            reference, parsers, get_pages(session, reference)
+        )
+        mode_to_parser[mode] = chosen
+        for name, elapsed, verdict in measurements:
+            yield (
+                mode,
+                name,
+                '' if elapsed is None else f'{elapsed:.1f}',
+                PARSER_CHOSEN if name == chosen else verdict
+            )
+    save_calibration(mode_to_parser)
+    logging.info(CALIBRATION_SAVED.format(mode_to_parser=mode_to_parser))
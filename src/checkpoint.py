@@ -0,0 +1,147 @@
+"""Журнал контрольных точек обхода страниц.
+
+Во время обхода url обработанных страниц и извлечённые из них данные
+дописываются в журнал режима и периодически сбрасываются на диск. Если
+обход прервался, с опцией --resume уже обработанные страницы повторно не
+загружаются: их данные берутся из журнала. После полного обхода журнал
+удаляется.
+
+У каждого способа запуска режима свой журнал: части --shard, наблюдение
+--watch и запуски из команд all и serve не перезаписывают и не удаляют
+журналы друг друга (например, pep-shard-1-of-2.jsonl, pep-watch.jsonl,
+serve-pep.jsonl).
+"""
+import json
+import logging
+import os
+import threading
+from argparse import Namespace
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from constants import (
+    BASE_DIR,
+    CHECKPOINT_DIR,
+    CHECKPOINT_FILE,
+    CHECKPOINT_INTERVAL,
+    CHECKPOINT_SHARD,
+    CHECKPOINT_WATCH
+)
+
+RESUMED_FROM_CHECKPOINT = (
+    'Обход продолжен с контрольной точки {file_path}, '
+    'обработанных страниц: {count}'
+)
+
+
+def load_journal(file_path: Path) -> Dict[str, Any]:
+    """Возвращает данные обработанных страниц из журнала.
+    Недописанная при сбое последняя запись пропускается.
+
+    Параметры:
+        file_path: Путь к журналу.
+    """
+    done = {}
+    try:
+        with open(file_path, encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                done[record['url']] = record['data']
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class Journal:
+    """Журнал контрольных точек одного режима работы."""
+
+    def __init__(self, file_path: Path, resume: bool) -> None:
+        self.file_path = file_path
+        self.done = load_journal(file_path) if resume else {}
+        self.lock = threading.Lock()
+        self.unsynced = 0
+        self.keep = False
+        file_path.parent.mkdir(exist_ok=True)
+        self.file = open(file_path, 'w', encoding='utf-8')
+        for url, data in self.done.items():
+            self.write(url, data)
+        self.sync()
+
+    def write(self, url: str, data: Any) -> None:
+        """Дописывает запись в журнал без сброса на диск."""
+        self.file.write(
+            json.dumps({'url': url, 'data': data}, ensure_ascii=False) + '\n'
+        )
+
+    def sync(self) -> None:
+        """Сбрасывает дописанные записи на диск."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def record(self, url: str, data: Any) -> None:
+        """Записывает данные обработанной страницы.
+        Журнал сбрасывается на диск каждые CHECKPOINT_INTERVAL записей.
+
+        Параметры:
+            url: Адрес страницы.
+            data: Данные, извлечённые со страницы.
+        """
+        with self.lock:
+            self.write(url, data)
+            self.unsynced += 1
+            if self.unsynced >= CHECKPOINT_INTERVAL:
+                self.sync()
+
+    def close(self) -> None:
+        """Сбрасывает оставшиеся записи на диск и закрывает журнал."""
+        with self.lock:
+            self.sync()
+            self.file.close()
+
+
+def journal_name(cli_args: Namespace) -> str:
+    """Возвращает имя журнала для способа запуска режима работы.
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+    """
+    parts: List[str] = []
+    if getattr(cli_args, 'command', None):
+        parts.append(cli_args.command)
+    parts.append(cli_args.mode)
+    if getattr(cli_args, 'shard', None):
+        index, count = cli_args.shard
+        parts.append(CHECKPOINT_SHARD.format(index=index, count=count))
+    if getattr(cli_args, 'watch', None):
+        parts.append(CHECKPOINT_WATCH)
+    return '-'.join(parts)
+
+
+@contextmanager
+def checkpoint_journal(cli_args: Namespace) -> Iterator[Journal]:
+    """Открывает журнал контрольных точек режима работы.
+    Если обход завершился полностью, журнал удаляется, иначе (сбой или
+    установленный флаг keep) сохраняется для запуска с опцией --resume.
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+    """
+    file_path = BASE_DIR / CHECKPOINT_DIR / CHECKPOINT_FILE.format(
+        name=journal_name(cli_args)
+    )
+    journal = Journal(file_path, cli_args.resume)
+    if journal.done:
+        logging.info(RESUMED_FROM_CHECKPOINT.format(
+            file_path=file_path, count=len(journal.done)
+        ))
+    try:
+        yield journal
+    finally:
+        journal.close()
+    if not journal.keep:
+        file_path.unlink()
@@ -1,20 +1,121 @@
 import argparse
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import KeysView
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Iterable, Tuple
 
 from constants import (
+    COMPRESSION_TO_SUFFIX,
     LOG_DATETIME_FORMAT,
     LOG_DIR,
     LOG_FILE,
     LOG_OUTPUT_FORMAT,
     OUTPUT_TO_FILE,
-    OUTPUT_TO_PRETTY_TABLE
+    OUTPUT_TO_JSON,
+    OUTPUT_TO_PRETTY_TABLE,
+    OUTPUT_TO_SQLITE,
+    OUTPUT_TO_STREAM_TABLE,
+    PARSER_AUTO,
+    PARSERS,
+    PIPELINE_FETCH_WORKERS,
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_REFRESH_INTERVAL
 )
 
+INVALID_SHARD = (
+    'Часть задаётся в виде i/N, где 1 <= i <= N, например 2/4: {value}'
+)
+
+INVALID_POSITIVE_INT = 'Ожидается целое число не меньше 1: {value}'
+INVALID_POSITIVE_FLOAT = 'Ожидается положительное число: {value}'
+
+INVALID_NUMBER_RANGE = (
+    'Номера задаются числом или диапазоном A-B, где A <= B, например 8-20: '
+    '{value}'
+)
+
+
+def parse_positive_int(value: str) -> int:
+    """
+    Разбирает целое число не меньше 1, например число потоков --workers.
+
+    Параметры:
+        value: Значение аргумента.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            INVALID_POSITIVE_INT.format(value=value)
+        )
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            INVALID_POSITIVE_INT.format(value=value)
+        )
+    return number
+
+
+def parse_positive_float(value: str) -> float:
+    """
+    Разбирает положительное число, например интервал в секундах.
+
+    Параметры:
+        value: Значение аргумента.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            INVALID_POSITIVE_FLOAT.format(value=value)
+        )
+    if not 0 < number < float('inf'):
+        raise argparse.ArgumentTypeError(
+            INVALID_POSITIVE_FLOAT.format(value=value)
+        )
+    return number
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Разбирает номер части и число частей из аргумента --shard.
+
+    Параметры:
+        value: Значение аргумента в виде i/N.
+    """
+    try:
+        index, count = map(int, value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(INVALID_SHARD.format(value=value))
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(INVALID_SHARD.format(value=value))
+    return index, count
+
+
+def parse_number_range(value: str) -> Tuple[int, int]:
+    """
+    Разбирает диапазон номеров PEP из аргумента --numbers.
+
+    Параметры:
+        value: Номер или диапазон номеров в виде A-B.
+    """
+    try:
+        low, _, high = value.partition('-')
+        low, high = int(low), int(high or low)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            INVALID_NUMBER_RANGE.format(value=value)
+        )
+    if low > high:
+        raise argparse.ArgumentTypeError(
+            INVALID_NUMBER_RANGE.format(value=value)
+        )
+    return low, high
+
 
 def configure_argument_parser(
-    available_modes: KeysView[str]
+    available_modes: Iterable[str]
 ) -> argparse.ArgumentParser:
     """
     Настраивает парсинг аргументов командной строки.
@@ -37,23 +138,161 @@ def configure_argument_parser(
     parser.add_argument(
         '-o',
         '--output',
-        choices=(OUTPUT_TO_PRETTY_TABLE, OUTPUT_TO_FILE),
+        choices=(
+            OUTPUT_TO_PRETTY_TABLE,
+            OUTPUT_TO_FILE,
+            OUTPUT_TO_JSON,
+            OUTPUT_TO_SQLITE,
+            OUTPUT_TO_STREAM_TABLE
+        ),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '-z',
+        '--compress',
+        choices=tuple(COMPRESSION_TO_SUFFIX),
+        help='Сжатие файла с результатами'
+    )
+    parser.add_argument(
+        '-p',
+        '--parser',
+        choices=(PARSER_AUTO, *PARSERS),
+        default=PARSER_AUTO,
+        help='Парсер HTML страниц'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=parse_positive_int,
+        default=PIPELINE_FETCH_WORKERS,
+        help='Число потоков загрузки страниц и распаковки архива'
+    )
+    parser.add_argument(
+        '--deadline',
+        type=parse_positive_float,
+        metavar='SECONDS',
+        help='Не загружать новые страницы через SECONDS секунд после '
+             'запуска режима'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=parse_positive_int,
+        metavar='N',
+        help='Загрузить не больше N страниц'
+    )
+    parser.add_argument(
+        '--extract',
+        action='store_true',
+        help='Проверить и распаковать архив (режим download)'
+    )
+    parser.add_argument(
+        '--extraction-cache',
+        action='store_true',
+        help='Сохранять данные, извлечённые со страниц, между запусками'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продолжить обход с последней контрольной точки'
+    )
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        help='Обработать часть i из N документов PEP (режим pep)'
+    )
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        '--record',
+        metavar='DIR',
+        help='Сохранять ответы сайтов в снимок в директории DIR'
+    )
+    replay_group.add_argument(
+        '--replay',
+        metavar='DIR',
+        help='Брать ответы сайтов из снимка в директории DIR без сети'
+    )
+    parser.add_argument(
+        '--status',
+        help='Статус документа в карточке PEP (команда query)'
+    )
+    parser.add_argument(
+        '--type',
+        help='Тип документа PEP: S, I или P (команда query)'
+    )
+    parser.add_argument(
+        '--mismatch',
+        action='store_true',
+        help='Только документы с несовпадающими статусами (команда query)'
+    )
+    parser.add_argument(
+        '--numbers',
+        type=parse_number_range,
+        metavar='A-B',
+        help='Номер или диапазон номеров PEP (команда query)'
+    )
+    parser.add_argument(
+        '--watch',
+        type=parse_positive_float,
+        metavar='INTERVAL',
+        help='Перезапускать режим каждые INTERVAL секунд и выводить '
+             'только изменения результатов'
+    )
+    parser.add_argument(
+        '--host',
+        default=SERVE_HOST,
+        help='Адрес сервера (команда serve)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=SERVE_PORT,
+        help='Порт сервера (команда serve)'
+    )
+    parser.add_argument(
+        '--refresh',
+        type=parse_positive_float,
+        default=SERVE_REFRESH_INTERVAL,
+        help='Интервал обновления результатов в секундах (команда serve)'
+    )
+    parser.add_argument(
+        '--pager',
+        action='store_true',
+        help='Постраничный вывод таблицы table',
+    )
     return parser
 
 
-def configure_logging() -> None:
-    """Настраивает логирование."""
+def default_cli_args(mode: str) -> argparse.Namespace:
+    """
+    Возвращает аргументы командной строки по умолчанию для режима работы.
+    Используется, когда режим вызывается без разбора командной строки.
+
+    Параметры:
+        mode: Режим работы парсера.
+    """
+    return configure_argument_parser((mode,)).parse_args((mode,))
+
+
+def configure_logging() -> QueueListener:
+    """Настраивает логирование.
+    Записи попадают в очередь и выводятся в файл и терминал отдельным
+    потоком, поэтому вызовы логирования не блокируют потоки парсера на
+    операциях ввода-вывода. Поток логирования останавливается при
+    завершении программы.
+    """
     LOG_DIR.mkdir(exist_ok=True)
-    logging.basicConfig(
-        datefmt=LOG_DATETIME_FORMAT,
-        format=LOG_OUTPUT_FORMAT,
-        level=logging.INFO,
-        handlers=(
-            RotatingFileHandler(
-                LOG_FILE, maxBytes=10 ** 6, backupCount=5
-            ),
-            logging.StreamHandler()
-        ),
+    formatter = logging.Formatter(LOG_OUTPUT_FORMAT, LOG_DATETIME_FORMAT)
+    handlers = (
+        RotatingFileHandler(LOG_FILE, maxBytes=10 ** 6, backupCount=5),
+        logging.StreamHandler()
     )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -4,19 +4,68 @@ BASE_DIR = Path(__file__).parent
 LOG_DIR = BASE_DIR / 'logs'
 LOG_FILE = LOG_DIR / 'parser.log'
 RESULTS_DIR = 'results'
+CACHE_DIR = 'cache'
+EXTRACTION_CACHE_FILE = 'extracted.pickle'
+EXTRACTION_CACHE_SIZE = 4096
+SHARD_FILE = 'pep-shard-{index}-of-{count}.json'
+SHARD_FILE_PATTERN = 'pep-shard-*-of-*.json'
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8000
+SERVE_REFRESH_INTERVAL = 900
+ARCHIVE_OBJECTS_DIR = 'objects'
+ARCHIVE_MANIFEST_FILE = 'manifest.json'
+EXTRACT_CHUNK_SIZE = 2 ** 20
+SNAPSHOT_BODIES_FILE = 'bodies.bin'
+SNAPSHOT_INDEX_FILE = 'index.json'
+PEP_INDEX_FILE = 'pep_index.sqlite3'
+SNAPSHOT_DIR = 'snapshots'
+SNAPSHOT_FILE = '{mode}.json'
+CHECKPOINT_DIR = 'checkpoints'
+CHECKPOINT_FILE = '{name}.jsonl'
+CHECKPOINT_SHARD = 'shard-{index}-of-{count}'
+CHECKPOINT_WATCH = 'watch'
+CHECKPOINT_INTERVAL = 20
 DOWNLOADS_DIR = 'downloads'
 OUTPUT_FILE = '{parser_mode}_{now_formatted}.csv'
+JSON_OUTPUT_FILE = '{parser_mode}_{now_formatted}.jsonl'
+SQLITE_OUTPUT_FILE = 'results.sqlite3'
+OUTPUT_BATCH_SIZE = 500
+TEMP_FILE_SUFFIX = '.tmp'
+TABLE_SAMPLE_SIZE = 50
+TABLE_MAX_CELL_WIDTH = 60
+DEFAULT_PAGER = 'less -FRSX'
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_URL = 'https://peps.python.org/'
 WHATS_NEW_URL_POSTFIX = 'whatsnew/'
 DOWNLOAD_URL_POSTFIX = 'download.html'
 
-FIND_TAG_BY_NAME = 'find_tag_by_name'
-FIND_TAG_BY_STRING = 'find_tag_by_string'
-FIND_NEXT_SIBLING = 'find_next_sibling'
+PARSER_AUTO = 'auto'
+PARSER_LXML = 'lxml'
+PARSER_HTML = 'html.parser'
+PARSER_LXML_HTML = 'lxml-html'
+PARSER_SELECTOLAX = 'selectolax'
+PARSERS = (PARSER_LXML, PARSER_HTML, PARSER_LXML_HTML, PARSER_SELECTOLAX)
+DEFAULT_PARSER = PARSER_LXML
+PARSERS_FILE = 'parsers.json'
+CALIBRATION_SAMPLE_SIZE = 10
+CALIBRATION_REPEAT = 3
+
+PIPELINE_FETCH_WORKERS = 4
+PIPELINE_QUEUE_SIZE = 16
+PIPELINE_POLL_INTERVAL = 0.1
+
 OUTPUT_TO_FILE = 'file'
 OUTPUT_TO_PRETTY_TABLE = 'pretty'
+OUTPUT_TO_STREAM_TABLE = 'table'
+OUTPUT_TO_JSON = 'jsonl'
+OUTPUT_TO_SQLITE = 'sqlite'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+COMPRESSION_TO_SUFFIX = {
+    COMPRESSION_GZIP: '.gz',
+    COMPRESSION_ZSTD: '.zst',
+}
 
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
@@ -1,2 +1,14 @@
 class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
+
+
+class MissingDependencyException(Exception):
+    """Вызывается, когда не установлена необязательная зависимость."""
+
+
+class IncompleteShardsException(Exception):
+    """Вызывается, когда для объединения не хватает частей режима pep."""
+
+
+class MissingPepIndexException(Exception):
+    """Вызывается, когда локальный индекс PEP ещё не создан."""
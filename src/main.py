@@ -1,37 +1,46 @@
+from __future__ import annotations
+
 import logging
-import re
+from argparse import Namespace
 from collections import defaultdict
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
 from urllib.parse import urljoin
 
-from requests_cache import CachedSession
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
-from constants import (
-    BASE_DIR,
-    DOWNLOADS_DIR,
-    DOWNLOAD_URL_POSTFIX,
-    EXPECTED_STATUS,
-    FIND_NEXT_SIBLING,
-    FIND_TAG_BY_STRING,
-    MAIN_DOC_URL,
-    PEP_URL,
-    WHATS_NEW_URL_POSTFIX
+from api import iter_latest_versions, iter_pep_statuses, iter_whats_new
+from archive_store import extract_archive, update_archive
+from calibration import calibrate
+from configs import (
+    configure_argument_parser,
+    configure_logging,
+    default_cli_args
 )
-from exceptions import ParserFindTagException
-from outputs import control_output
-from utils import get_soup, get_response, find_tag
+from constants import DOWNLOAD_URL_POSTFIX, EXPECTED_STATUS, MAIN_DOC_URL
+from outputs import PARALLEL_OUTPUTS, control_output
+from pep_index import query, save_pep_index
+from shards import in_shard, load_shards, order_statuses, save_shard
+from transport import open_session
+from utils import get_document
+from watch import watch
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
 
+    from api import Crawl, PepStatus
+    from pipeline import Budget, Task
 
 START_PARSER_WORKING = 'Парсер запущен!'
 CLI_ARGS = 'Аргументы командной строки: {args}'
 FINISH_PARSER_WORKING = 'Парсер завершил работу.'
-NOT_FIND_TAG_ERROR = 'Не найден тег {tag} {attrs} {string}'
-REQUEST_ERROR = 'Возникла ошибка при загрузке страницы {url} {error}'
-SUCCESS_ARCHIVE_DOWNLOAD = (
-    'Архив был загружен и сохранён: {archive_path}'
-)
 MISMATCHED_STATUS = (
     'Несовпадающие статусы:\n'
     '{pep_link}\n'
@@ -39,6 +48,7 @@ MISMATCHED_STATUS = (
     'Ожидаемые статусы: {expected_status}\n'
 )
 MAIN_ERROR_MESSAGE = 'Сбой в работе программы: {error}'
+MODE_ERROR_MESSAGE = 'Сбой в режиме {mode}: {error}'
 
 WHATS_NEW_TABLE_COLUMN_HEADERS = (
     'Ссылка на статью', 'Заголовок', 'Редактор, автор'
@@ -49,143 +59,242 @@ LATEST_VERSIONS_TABLE_COLUMN_HEADERS = (
 PEP_TABLE_COLUMN_HEADERS = (
     'Статус', 'Количество'
 )
+PEP_WATCH_COLUMN_HEADERS = (
+    'Номер', 'Название', 'Статус в карточке'
+)
 
 
-def whats_new(session: CachedSession) -> List[Tuple[str, ...]]:
-    """Собирает информацию о нововведениях в версиях Python.
+def mode_crawl(
+    cli_args: Namespace,
+    budget: Budget,
+    select: Optional[Callable[[Task], bool]] = None
+) -> Crawl:
+    """Возвращает функцию обхода страниц для режима работы: с ограничением
+    обхода, журналом контрольных точек, кешем извлечения и индикатором
+    прогресса.
 
     Параметры:
-        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+        budget: Ограничение обхода.
+        select: Отбор заданий обхода, например по части --shard.
     """
-    whats_new_url = urljoin(MAIN_DOC_URL, WHATS_NEW_URL_POSTFIX)
-    results = [WHATS_NEW_TABLE_COLUMN_HEADERS]
-    unavailable_links = []
-    for a_tag in tqdm(get_soup(session, whats_new_url).select(
-        '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > '
-        'a[href!="changelog.html"]'
-    )):
-        version_link = urljoin(whats_new_url, a_tag['href'])
-        try:
-            soup = get_soup(session, version_link)
-        except ConnectionError as error:
-            unavailable_links.append(
-                REQUEST_ERROR.format(url=version_link, error=error)
-            )
-            continue
-        results.append(
-            (
-                version_link,
-                find_tag(soup, 'h1').text,
-                find_tag(soup, 'dl').text.replace('\n', ' ')
-            )
+    def crawl_tasks(
+        session: CachedSession,
+        parser: Any,
+        tasks: List[Task],
+        method: str,
+        build: Callable[[str, Any, Any], Any]
+    ) -> Iterator[Any]:
+        from tqdm import tqdm
+
+        from pipeline import crawl
+
+        if select is not None:
+            tasks = [task for task in tasks if select(task)]
+        return tqdm(
+            crawl(session, parser, tasks, method, build, cli_args, budget),
+            total=len(tasks)
         )
-    logging.error('\n'.join(unavailable_links))
-    return results
+
+    return crawl_tasks
+
+
+def whats_new(
+    session: CachedSession,
+    cli_args: Optional[Namespace] = None
+) -> Iterator[Tuple[str, ...]]:
+    """Собирает информацию о нововведениях в версиях Python.
+    Строки результата отдаются по мере обработки страниц, первой - шапка
+    таблицы. Если обход остановлен ограничением --deadline или --max-pages,
+    последней отдаётся строка-отметка о частичных результатах.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    from parsers import parser_name
+    from pipeline import Budget
+
+    cli_args = cli_args or default_cli_args('whats-new')
+    budget = Budget(cli_args.deadline, cli_args.max_pages)
+    yield WHATS_NEW_TABLE_COLUMN_HEADERS
+    yield from map(tuple, iter_whats_new(
+        session,
+        parser=parser_name(cli_args),
+        crawl=mode_crawl(cli_args, budget)
+    ))
+    if budget.exhausted:
+        yield budget.partial_row(WHATS_NEW_TABLE_COLUMN_HEADERS)
 
 
-def latest_versions(session: CachedSession) -> List[Tuple[str, ...]]:
+def latest_versions(
+    session: CachedSession,
+    cli_args: Optional[Namespace] = None
+) -> Iterator[Tuple[str, ...]]:
     """Собирает информацию о статусах версий Python.
+    Первой строкой результата отдаётся шапка таблицы.
 
     Параметры:
-        session: Сессия для запросов к сайту.
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
     """
-    for ul in get_soup(session, MAIN_DOC_URL).select(
-        'div.sphinxsidebarwrapper ul'
-    ):
-        if 'All versions' in ul.text:
-            a_tags = ul.find_all(name='a')
-            break
-    else:
-        raise ParserFindTagException(
-            NOT_FIND_TAG_ERROR.format(tag='ul', attrs=None, string=None)
-        )
-    results = [LATEST_VERSIONS_TABLE_COLUMN_HEADERS]
-    for a_tag in a_tags:
-        text_match = re.search(
-            r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)',
-            a_tag.text
-        )
-        if text_match is not None:
-            version, status = text_match.groups()
-        else:
-            version, status = a_tag.text, ''
-        results.append((a_tag['href'], version, status))
-    return results
+    from parsers import parser_name
 
+    cli_args = cli_args or default_cli_args('latest-versions')
+    yield LATEST_VERSIONS_TABLE_COLUMN_HEADERS
+    yield from map(tuple, iter_latest_versions(
+        session, parser=parser_name(cli_args)
+    ))
 
-def download(session: CachedSession) -> None:
-    """Скачивает архив с документацией Python.
+
+def download(
+    session: CachedSession,
+    cli_args: Optional[Namespace] = None
+) -> None:
+    """Скачивает архив с документацией Python, если он изменился.
+    С опцией --extract архив проверяется и распаковывается.
 
     Параметры:
-        session: Сессия для запросов к сайту.
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
     """
+    from parsers import get_parser
+
+    cli_args = cli_args or default_cli_args('download')
+    parser = get_parser(cli_args)
     downloads_url = urljoin(MAIN_DOC_URL, DOWNLOAD_URL_POSTFIX)
-    pdf_a4_tag = get_soup(session, downloads_url).select_one(
-        'div[role="main"] table.docutils a[href$="pdf-a4.zip"]'
-    )
-    if pdf_a4_tag is None:
-        raise ParserFindTagException(
-            NOT_FIND_TAG_ERROR.format(
-                tag='a', attrs={'href$': 'pdf-a4.zip'}, string=None
-            )
+    archive_url = urljoin(downloads_url, parser.pdf_a4_link(
+        get_document(session, downloads_url, parser)
+    ))
+    archive_path = update_archive(session, archive_url)
+    if cli_args.extract:
+        extract_archive(archive_path, cli_args.workers)
+
+
+def crawl_peps(
+    session: CachedSession,
+    cli_args: Namespace,
+    budget: Budget
+) -> Iterator[PepStatus]:
+    """Отдаёт статусы документов PEP части --shard (или всех документов).
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+        budget: Ограничение обхода.
+    """
+    from parsers import parser_name
+
+    shard = cli_args.shard
+    return iter_pep_statuses(
+        session,
+        parser=parser_name(cli_args),
+        crawl=mode_crawl(
+            cli_args,
+            budget,
+            (lambda task: in_shard(task[1].href, shard)) if shard else None
         )
-    archive_url = urljoin(downloads_url, pdf_a4_tag['href'])
-    response = get_response(session, archive_url)
-    downloads_dir = BASE_DIR / DOWNLOADS_DIR
-    downloads_dir.mkdir(exist_ok=True)
-    archive_path = downloads_dir / archive_url.split('/')[-1]
-    with open(archive_path, 'wb') as zip_file:
-        zip_file.write(response.content)
-    logging.info(
-        SUCCESS_ARCHIVE_DOWNLOAD.format(archive_path=archive_path)
     )
 
 
-def pep(session: CachedSession) -> List[Tuple[str, ...]]:
+def pep(
+    session: CachedSession,
+    cli_args: Optional[Namespace] = None
+) -> Iterator[Tuple[str, ...]]:
     """Собирает информацию о статусах документов PEP.
+    Шапка таблицы отдаётся сразу, количество документов по статусам - после
+    обработки всех страниц. Данные каждого документа сохраняются в
+    локальный индекс PEP для команды query. Если обход остановлен
+    ограничением, последней отдаётся строка-отметка о частичных результатах.
 
     Параметры:
-        session: Сессия для запросов к сайту.
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
     """
+    from pipeline import Budget
+
+    cli_args = cli_args or default_cli_args('pep')
+    budget = Budget(cli_args.deadline, cli_args.max_pages)
+    yield PEP_TABLE_COLUMN_HEADERS
     results = defaultdict(int)
-    unavailable_links = []
-    mismatched_statuses = []
-    for row in tqdm(get_soup(session, PEP_URL).select(
-        '#numerical-index table.pep-zero-table tbody tr'
-    )):
-        expected_status = find_tag(row, 'abbr').text[1:]
-        pep_link = urljoin(PEP_URL, find_tag(row, 'a')['href'])
-        try:
-            soup = get_soup(session, pep_link)
-        except ConnectionError as error:
-            unavailable_links.append(
-                REQUEST_ERROR.format(url=pep_link, error=error)
+    first_numbers = {}
+    mismatches = []
+    records = []
+    for status in crawl_peps(session, cli_args, budget):
+        results[status.page_status] += 1
+        first_numbers.setdefault(status.page_status, status.number)
+        records.append((
+            status.number, status.title, status.type, status.index_status,
+            status.page_status, not status.matched, status.url
+        ))
+        if not status.matched:
+            mismatch = dict(
+                pep_link=status.url,
+                current_status=status.page_status,
+                expected_status=EXPECTED_STATUS.get(status.index_status, ())
             )
-            continue
-        current_status = find_tag(
-            find_tag(
-                soup,
-                string=re.compile('Status'),
-                find_type=FIND_TAG_BY_STRING
-            ),
-            find_type=FIND_NEXT_SIBLING
-        ).text
-        results[current_status] += 1
-        if current_status not in EXPECTED_STATUS[expected_status]:
-            mismatched_statuses.append(
-                MISMATCHED_STATUS.format(
-                    pep_link=pep_link,
-                    current_status=current_status,
-                    expected_status=EXPECTED_STATUS[expected_status]
-                )
-            )
-    logging.error('\n'.join(unavailable_links))
-    logging.info('\n'.join(mismatched_statuses))
-    return [
-        PEP_TABLE_COLUMN_HEADERS,
-        *results.items(),
-        ('Всего', sum(results.values())),
-    ]
+            logging.info(MISMATCHED_STATUS.format(**mismatch), extra=mismatch)
+            mismatches.append(mismatch)
+    save_pep_index(records)
+    results = order_statuses(results, first_numbers)
+    if cli_args.shard:
+        save_shard(
+            cli_args.shard, results, mismatches, budget.reason, first_numbers
+        )
+    yield from results.items()
+    yield 'Всего', sum(results.values())
+    if budget.exhausted:
+        yield budget.partial_row(PEP_TABLE_COLUMN_HEADERS)
+
+
+def pep_statuses(
+    session: CachedSession,
+    cli_args: Namespace
+) -> Iterator[Tuple[object, ...]]:
+    """Собирает статусы в карточках документов PEP по номерам.
+    Используется вместо режима pep с опцией --watch, чтобы видеть, у
+    какого документа изменился статус, а не только количество по статусам.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    from pipeline import Budget
+
+    budget = Budget(cli_args.deadline, cli_args.max_pages)
+    yield PEP_WATCH_COLUMN_HEADERS
+    for status in crawl_peps(session, cli_args, budget):
+        yield status.number, status.title, status.page_status
+    if budget.exhausted:
+        yield budget.partial_row(PEP_WATCH_COLUMN_HEADERS)
+
+
+def merge(
+    session: CachedSession,
+    cli_args: Namespace
+) -> Iterator[Tuple[str, ...]]:
+    """Объединяет результаты частей режима pep, запущенных с --shard.
+    Выводит ту же таблицу и тот же отчёт о несовпадающих статусах, что и
+    режим pep без разбиения. Если обход какой-либо части был остановлен
+    ограничением, последней отдаётся строка-отметка о частичных результатах
+    с причинами остановки частей.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    from pipeline import BUDGET_EXHAUSTED, PARTIAL_RESULT
+
+    results, mismatches, partial = load_shards()
+    yield PEP_TABLE_COLUMN_HEADERS
+    for mismatch in mismatches:
+        logging.info(MISMATCHED_STATUS.format(**mismatch), extra=mismatch)
+    yield from results.items()
+    yield 'Всего', sum(results.values())
+    if partial:
+        reason = '; '.join(partial)
+        logging.warning(BUDGET_EXHAUSTED.format(reason=reason))
+        yield PARTIAL_RESULT, reason
 
 
 MODE_TO_FUNCTION = {
@@ -194,6 +303,88 @@ MODE_TO_FUNCTION = {
     'download': download,
     'pep': pep
 }
+WATCH_MODE_TO_FUNCTION = {
+    'pep': pep_statuses
+}
+
+
+def run_mode(
+    session: CachedSession,
+    cli_args: Namespace
+) -> Optional[List[Tuple[str, ...]]]:
+    """Запускает режим работы в составе режима all.
+    Результаты записываются в файл сразу, а для вывода в терминал или в
+    базу SQLite возвращаются целиком, чтобы режимы не смешивали вывод.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки режима.
+    """
+    results = MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
+    if results is None:
+        return None
+    if cli_args.output in PARALLEL_OUTPUTS:
+        control_output(results, cli_args)
+        return None
+    return list(results)
+
+
+def all_modes(session: CachedSession, cli_args: Namespace) -> None:
+    """Запускает все режимы работы одновременно в одном процессе.
+    Режимы используют общую сессию, результаты каждого режима выводятся
+    отдельно. Сбой одного режима не останавливает остальные.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    mode_to_args = {
+        mode: Namespace(**{
+            **vars(cli_args), 'mode': mode, 'command': cli_args.mode
+        })
+        for mode in MODE_TO_FUNCTION
+    }
+    with ThreadPoolExecutor(max_workers=len(mode_to_args)) as executor:
+        mode_to_future = {
+            mode: executor.submit(run_mode, session, mode_args)
+            for mode, mode_args in mode_to_args.items()
+        }
+        for mode, future in mode_to_future.items():
+            try:
+                results = future.result()
+            except Exception as error:
+                logging.exception(
+                    MODE_ERROR_MESSAGE.format(mode=mode, error=error)
+                )
+                continue
+            if results is not None:
+                control_output(results, mode_to_args[mode])
+
+
+def serve(session: CachedSession, cli_args: Namespace) -> None:
+    """Запускает HTTP-сервер с результатами режимов работы в формате JSON.
+    Режим download не обслуживается: он сохраняет архив, а не таблицу.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    from server import run_server
+
+    run_server(session, cli_args, {
+        mode: function for mode, function in MODE_TO_FUNCTION.items()
+        if mode != 'download'
+    })
+
+
+COMMAND_TO_FUNCTION = {
+    'all': all_modes,
+    'calibrate': calibrate,
+    'merge': merge,
+    'query': query,
+    'serve': serve,
+}
+OFFLINE_COMMANDS = frozenset({'merge', 'query'})
 
 
 def main() -> None:
@@ -201,15 +392,27 @@ def main() -> None:
     try:
         configure_logging()
         logging.info(START_PARSER_WORKING)
-        arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
+        arg_parser = configure_argument_parser(
+            (*MODE_TO_FUNCTION, *COMMAND_TO_FUNCTION)
+        )
         args = arg_parser.parse_args()
         logging.info(CLI_ARGS.format(args=args))
-        session = CachedSession()
-        if args.clear_cache:
-            session.cache.clear()
-        results = MODE_TO_FUNCTION[args.mode](session)
-        if results is not None:
-            control_output(results, args)
+        if args.mode in OFFLINE_COMMANDS:
+            context = nullcontext()
+        else:
+            context = open_session(args)
+        with context as session:
+            function = {**MODE_TO_FUNCTION, **COMMAND_TO_FUNCTION}[args.mode]
+            if args.watch:
+                watch(
+                    session,
+                    args,
+                    WATCH_MODE_TO_FUNCTION.get(args.mode, function)
+                )
+            else:
+                results = function(session, args)
+                if results is not None:
+                    control_output(results, args)
         logging.info(FINISH_PARSER_WORKING)
     except Exception as error:
         logging.exception(
@@ -0,0 +1,122 @@
+"""Кеш данных, извлечённых со страниц.
+
+Кеш извлечения хранит данные, извлечённые со страниц, по хешу содержимого
+страницы, поэтому неизменившиеся страницы при повторном обходе не
+разбираются. Кеш ограничен по размеру (вытесняются давно не
+использованные записи) и может сохраняться на диск между запусками.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from constants import (
+    BASE_DIR,
+    CACHE_DIR,
+    EXTRACTION_CACHE_FILE,
+    EXTRACTION_CACHE_SIZE,
+    TEMP_FILE_SUFFIX
+)
+
+MISSING = object()
+
+EXTRACTION_CACHE_NOT_LOADED = (
+    'Не удалось загрузить кеш извлечения {file_path}: {error}'
+)
+
+
+class ExtractionCache:
+    """Потокобезопасный LRU-кеш данных, извлечённых со страниц."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.items: 'OrderedDict[Tuple[str, ...], Any]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.file_path: Optional[Path] = None
+
+    @staticmethod
+    def key(parser_name: str, method: str, text: str) -> Tuple[str, ...]:
+        """Возвращает ключ кеша для страницы.
+
+        Параметры:
+            parser_name: Имя парсера.
+            method: Имя метода извлечения.
+            text: HTML страницы.
+        """
+        digest = hashlib.blake2b(
+            text.encode('utf-8'), digest_size=16
+        ).hexdigest()
+        return parser_name, method, digest
+
+    def get(self, key: Tuple[str, ...]) -> Any:
+        """Возвращает данные по ключу или MISSING."""
+        with self.lock:
+            data = self.items.get(key, MISSING)
+            if data is not MISSING:
+                self.items.move_to_end(key)
+            return data
+
+    def put(self, key: Tuple[str, ...], data: Any) -> None:
+        """Сохраняет данные, вытесняя давно не использованные записи."""
+        with self.lock:
+            self.items[key] = data
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def load(self, file_path: Path) -> None:
+        """Подключает файл кеша и загружает из него записи.
+        Загрузка выполняется один раз, повреждённый файл игнорируется.
+
+        Параметры:
+            file_path: Путь к файлу кеша.
+        """
+        with self.lock:
+            if self.file_path == file_path:
+                return
+            self.file_path = file_path
+            try:
+                with open(file_path, 'rb') as cache_file:
+                    items = pickle.load(cache_file)
+            except FileNotFoundError:
+                return
+            except (pickle.UnpicklingError, EOFError, ValueError) as error:
+                logging.warning(EXTRACTION_CACHE_NOT_LOADED.format(
+                    file_path=file_path, error=error
+                ))
+                return
+            items.update(self.items)
+            self.items = OrderedDict(items)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def save(self) -> None:
+        """Сохраняет записи в подключённый файл кеша, если он есть."""
+        with self.lock:
+            if self.file_path is None:
+                return
+            self.file_path.parent.mkdir(exist_ok=True)
+            temp_path = self.file_path.with_name(
+                self.file_path.name + TEMP_FILE_SUFFIX
+            )
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump(dict(self.items), cache_file)
+            os.replace(temp_path, self.file_path)
+
+
+EXTRACTION_CACHE = ExtractionCache(EXTRACTION_CACHE_SIZE)
+
+
+def get_extraction_cache(persistent: bool) -> ExtractionCache:
+    """Возвращает кеш извлечения процесса.
+
+    Параметры:
+        persistent: Нужно ли сохранять кеш на диск между запусками.
+    """
+    if persistent:
+        EXTRACTION_CACHE.load(BASE_DIR / CACHE_DIR / EXTRACTION_CACHE_FILE)
+    return EXTRACTION_CACHE
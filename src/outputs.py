@@ -1,76 +1,373 @@
 import csv
 import datetime as dt
+import gzip
+import json
 import logging
+import os
+import shlex
+import sqlite3
+import subprocess
+import sys
 from argparse import Namespace
-from typing import List, Tuple
-
-from prettytable import PrettyTable
+from contextlib import contextmanager
+from itertools import chain, islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
 
 from constants import (
     BASE_DIR,
+    COMPRESSION_GZIP,
+    COMPRESSION_TO_SUFFIX,
+    COMPRESSION_ZSTD,
+    DEFAULT_PAGER,
     FILE_DATETIME_FORMAT,
+    JSON_OUTPUT_FILE,
+    OUTPUT_BATCH_SIZE,
     OUTPUT_FILE,
     OUTPUT_TO_FILE,
+    OUTPUT_TO_JSON,
     OUTPUT_TO_PRETTY_TABLE,
-    RESULTS_DIR
+    OUTPUT_TO_SQLITE,
+    OUTPUT_TO_STREAM_TABLE,
+    RESULTS_DIR,
+    SQLITE_OUTPUT_FILE,
+    TABLE_MAX_CELL_WIDTH,
+    TABLE_SAMPLE_SIZE,
+    TEMP_FILE_SUFFIX
 )
+from exceptions import MissingDependencyException
 
 SUCCESS_FILE_CREATED = 'Файл с результатами был сохранён: {file_path}'
+UNFINISHED_FILE_KEPT = (
+    'Запись файла {file_path} прервана, собранные данные сохранены '
+    'во временном файле {temp_path}'
+)
+ZSTD_NOT_INSTALLED = (
+    'Для сжатия zstd установите пакет zstandard: pip install zstandard'
+)
+SUCCESS_ROWS_INSERTED = (
+    'В таблицу {table} базы {file_path} добавлено строк: {count}'
+)
+CREATE_TABLE_SQL = (
+    'CREATE TABLE IF NOT EXISTS {table} (run_at TEXT NOT NULL, {columns})'
+)
+CREATE_INDEX_SQL = 'CREATE INDEX IF NOT EXISTS {index} ON {table} (run_at)'
+INSERT_SQL = 'INSERT INTO {table} VALUES (?, {placeholders})'
+
+
+def get_results_path(file_name: str) -> Path:
+    """Возвращает путь к файлу в директории результатов, создавая её.
+
+    Параметры:
+        file_name: Имя файла.
+    """
+    results_dir = BASE_DIR / RESULTS_DIR
+    results_dir.mkdir(exist_ok=True)
+    return results_dir / file_name
+
+
+def get_output_file_path(file_pattern: str, cli_args: Namespace) -> Path:
+    """Возвращает путь к файлу результатов для текущего запуска.
+
+    Параметры:
+        file_pattern: Шаблон имени файла.
+        cli_args: Аргументы командной строки.
+    """
+    return get_results_path(file_pattern.format(
+        parser_mode=cli_args.mode,
+        now_formatted=dt.datetime.now().strftime(FILE_DATETIME_FORMAT)
+    ) + COMPRESSION_TO_SUFFIX.get(cli_args.compress, ''))
+
+
+def open_compressed(file_path: Path, compression: Optional[str]) -> IO[str]:
+    """Открывает текстовый файл на запись со сжатием на лету.
+
+    Параметры:
+        file_path: Путь к файлу.
+        compression: Алгоритм сжатия или None, если сжатие не нужно.
+    """
+    if compression == COMPRESSION_GZIP:
+        return gzip.open(file_path, 'wt', encoding='utf-8')
+    if compression == COMPRESSION_ZSTD:
+        try:
+            import zstandard
+        except ImportError:
+            raise MissingDependencyException(ZSTD_NOT_INSTALLED)
+        return zstandard.open(file_path, 'wt', encoding='utf-8')
+    return open(file_path, 'w', encoding='utf-8')
+
+
+@contextmanager
+def atomic_output_file(
+    file_path: Path,
+    compression: Optional[str]
+) -> Iterator[IO[str]]:
+    """Открывает файл результатов так, чтобы он появлялся только целиком.
+    Данные пишутся во временный файл рядом с итоговым, который после
+    успешной записи переименовывается в итоговый. При сбое временный файл
+    остаётся на диске с уже собранными данными.
+
+    Параметры:
+        file_path: Путь к итоговому файлу.
+        compression: Алгоритм сжатия или None, если сжатие не нужно.
+    """
+    temp_path = file_path.with_name(f'.{file_path.name}{TEMP_FILE_SUFFIX}')
+    try:
+        with open_compressed(temp_path, compression) as output_file:
+            yield output_file
+    except BaseException:
+        logging.warning(UNFINISHED_FILE_KEPT.format(
+            file_path=file_path, temp_path=temp_path
+        ))
+        raise
+    os.replace(temp_path, file_path)
+
+
+def batched(
+    rows: Iterable[Tuple[str, ...]],
+    size: int
+) -> Iterator[List[Tuple[str, ...]]]:
+    """Разбивает строки результатов на пачки заданного размера.
+
+    Параметры:
+        rows: Строки результатов.
+        size: Размер пачки.
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def quote_identifier(name: str) -> str:
+    """Экранирует имя таблицы или столбца для SQLite.
+
+    Параметры:
+        name: Имя таблицы или столбца.
+    """
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def format_cell(cell: object, width: int) -> str:
+    """Приводит значение ячейки к заданной ширине.
+    Переводы строк заменяются пробелами, длинные значения обрезаются.
+
+    Параметры:
+        cell: Значение ячейки.
+        width: Ширина столбца.
+    """
+    text = ' '.join(str(cell).split('\n'))
+    if len(text) > width:
+        text = text[:width - 1] + '…'
+    return text.ljust(width)
+
+
+@contextmanager
+def open_pager(enabled: bool) -> Iterator[IO[str]]:
+    """Открывает поток вывода в программу постраничного просмотра.
+    Программа берётся из переменной окружения PAGER. Если постраничный
+    вывод не нужен или программа не найдена, используется стандартный вывод.
+
+    Параметры:
+        enabled: Нужен ли постраничный вывод.
+    """
+    if not enabled or not sys.stdout.isatty():
+        yield sys.stdout
+        return
+    try:
+        pager = subprocess.Popen(
+            shlex.split(os.environ.get('PAGER', DEFAULT_PAGER)),
+            stdin=subprocess.PIPE,
+            encoding='utf-8'
+        )
+    except OSError:
+        yield sys.stdout
+        return
+    try:
+        yield pager.stdin
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        pager.wait()
+
+
+def stream_table_output(
+    results: Iterable[Tuple[str, ...]],
+    cli_args: Namespace
+) -> None:
+    """Выводит данные в терминал таблицей по мере их получения.
+    Ширина столбцов вычисляется по первым TABLE_SAMPLE_SIZE строкам и
+    ограничена TABLE_MAX_CELL_WIDTH символами, более длинные значения
+    обрезаются.
+
+    Параметры:
+        results: Результаты парсинга.
+        cli_args: Аргументы командной строки.
+    """
+    rows = iter(results)
+    header = next(rows)
+    sample = list(islice(rows, TABLE_SAMPLE_SIZE))
+    widths = [
+        min(max(len(str(cell)) for cell in column), TABLE_MAX_CELL_WIDTH)
+        for column in zip(header, *sample)
+    ]
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    def format_row(row: Tuple[str, ...]) -> str:
+        return '| ' + ' | '.join(
+            format_cell(cell, width) for cell, width in zip(row, widths)
+        ) + ' |'
+
+    with open_pager(cli_args.pager) as stream:
+        print(border, format_row(header), border, sep='\n', file=stream)
+        for row in chain(sample, rows):
+            print(format_row(row), file=stream, flush=True)
+        print(border, file=stream)
 
 
-def pretty_output(results: List[Tuple[str, ...]], *args) -> None:
+def pretty_output(results: Iterable[Tuple[str, ...]], *args) -> None:
     """
     Выводит данные в терминал в формате PrettyTable.
+    Ширина столбцов известна только после получения всех строк, поэтому
+    результаты накапливаются в таблице и выводятся целиком.
 
     Параметры:
         results: Результаты парсинга.
     """
+    from prettytable import PrettyTable
+
+    rows = iter(results)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(rows)
     table.align = 'l'
-    table.add_rows(results[1:])
+    for row in rows:
+        table.add_row(row)
     print(table)
 
 
-def file_output(results: List[Tuple[str, ...]], cli_args: Namespace) -> None:
-    """Сохраняет данные в файл.
+def file_output(
+    results: Iterable[Tuple[str, ...]],
+    cli_args: Namespace
+) -> None:
+    """Сохраняет данные в файл в формате CSV, при необходимости сжимая его.
+    Строки записываются на диск пачками по мере получения, а итоговый файл
+    появляется в директории результатов только после записи всех строк.
 
     Параметры:
         results: Результаты парсинга.
         cli_args: Аргументы командной строки.
     """
-    results_dir = BASE_DIR / RESULTS_DIR
-    results_dir.mkdir(exist_ok=True)
-    file_path = results_dir / OUTPUT_FILE.format(
-        parser_mode=cli_args.mode,
-        now_formatted=dt.datetime.now().strftime(FILE_DATETIME_FORMAT)
-    )
-    with open(file_path, 'w', encoding='utf-8') as csv_file:
+    file_path = get_output_file_path(OUTPUT_FILE, cli_args)
+    with atomic_output_file(file_path, cli_args.compress) as csv_file:
         writer = csv.writer(csv_file, dialect=csv.unix_dialect)
-        writer.writerows(results)
+        for batch in batched(results, OUTPUT_BATCH_SIZE):
+            writer.writerows(batch)
+            csv_file.flush()
+    logging.info(SUCCESS_FILE_CREATED.format(file_path=file_path))
+
+
+def json_output(
+    results: Iterable[Tuple[str, ...]],
+    cli_args: Namespace
+) -> None:
+    """Сохраняет данные в файл в формате JSON Lines.
+    Каждая строка результатов становится объектом, ключи которого - названия
+    столбцов из шапки таблицы. Строки записываются пачками, а итоговый файл
+    появляется только после записи всех строк.
+
+    Параметры:
+        results: Результаты парсинга.
+        cli_args: Аргументы командной строки.
+    """
+    rows = iter(results)
+    header = next(rows)
+    file_path = get_output_file_path(JSON_OUTPUT_FILE, cli_args)
+    with atomic_output_file(file_path, cli_args.compress) as json_file:
+        for batch in batched(rows, OUTPUT_BATCH_SIZE):
+            json_file.writelines(
+                json.dumps(dict(zip(header, row)), ensure_ascii=False) + '\n'
+                for row in batch
+            )
+            json_file.flush()
     logging.info(SUCCESS_FILE_CREATED.format(file_path=file_path))
 
 
-def default_output(results: List[Tuple[str, ...]], *args) -> None:
+def sqlite_output(
+    results: Iterable[Tuple[str, ...]],
+    cli_args: Namespace
+) -> None:
+    """Добавляет данные в таблицу режима работы парсера в базе SQLite.
+    Таблица хранит историю запусков: каждая строка помечается временем
+    запуска. Строки вставляются пачками в рамках одной транзакции.
+
+    Параметры:
+        results: Результаты парсинга.
+        cli_args: Аргументы командной строки.
     """
-    Выводит данные в терминал построчно.
+    rows = iter(results)
+    header = next(rows)
+    run_at = dt.datetime.now().isoformat(sep=' ', timespec='seconds')
+    table = quote_identifier(cli_args.mode)
+    file_path = get_results_path(SQLITE_OUTPUT_FILE)
+    connection = sqlite3.connect(file_path)
+    count = 0
+    try:
+        with connection:
+            connection.execute(CREATE_TABLE_SQL.format(
+                table=table,
+                columns=', '.join(map(quote_identifier, header))
+            ))
+            connection.execute(CREATE_INDEX_SQL.format(
+                index=quote_identifier(f'{cli_args.mode}_run_at'),
+                table=table
+            ))
+            insert_sql = INSERT_SQL.format(
+                table=table,
+                placeholders=', '.join('?' * len(header))
+            )
+            for batch in batched(rows, OUTPUT_BATCH_SIZE):
+                connection.executemany(
+                    insert_sql, ((run_at, *row) for row in batch)
+                )
+                count += len(batch)
+    finally:
+        connection.close()
+    logging.info(SUCCESS_ROWS_INSERTED.format(
+        table=table, file_path=file_path, count=count
+    ))
+
+
+def default_output(results: Iterable[Tuple[str, ...]], *args) -> None:
+    """
+    Выводит данные в терминал построчно по мере их получения.
 
     Параметры:
         results: Результаты парсинга.
     """
     for row in results:
-        print(*row)
+        print(*row, flush=True)
+
 
+PARALLEL_OUTPUTS = (OUTPUT_TO_FILE, OUTPUT_TO_JSON)
 
 OUTPUT_TO_FUNCTION = {
     OUTPUT_TO_PRETTY_TABLE: pretty_output,
+    OUTPUT_TO_STREAM_TABLE: stream_table_output,
     OUTPUT_TO_FILE: file_output,
+    OUTPUT_TO_JSON: json_output,
+    OUTPUT_TO_SQLITE: sqlite_output,
     None: default_output
 }
 
 
 def control_output(
-    results: List[Tuple[str, ...]],
+    results: Iterable[Tuple[str, ...]],
     cli_args: Namespace
 ) -> None:
     """Контролирует вывод результатов парсинга.
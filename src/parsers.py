@@ -0,0 +1,400 @@
+"""Парсеры HTML с общим интерфейсом извлечения данных.
+
+Каждый парсер разбирает страницу в собственное представление документа и
+извлекает из него данные для режимов работы. Результаты извлечения у всех
+парсеров должны совпадать, отличается только скорость.
+"""
+import json
+from argparse import Namespace
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from constants import (
+    BASE_DIR,
+    DEFAULT_PARSER,
+    PARSER_AUTO,
+    PARSER_HTML,
+    PARSER_LXML,
+    PARSER_LXML_HTML,
+    PARSER_SELECTOLAX,
+    PARSERS_FILE
+)
+from exceptions import MissingDependencyException, ParserFindTagException
+from utils import (
+    NOT_FIND_TAG_ERROR,
+    find_next_sibling,
+    find_tag,
+    find_tag_by_string
+)
+
+SELECTOLAX_NOT_INSTALLED = (
+    'Для парсера selectolax установите пакет selectolax: '
+    'pip install selectolax'
+)
+PDF_A4_SUFFIX = 'pdf-a4.zip'
+ALL_VERSIONS = 'All versions'
+STATUS_FIELD = 'Status'
+
+
+class PepRow(NamedTuple):
+    """Строка таблицы PEP 0: сокращение типа и статуса, ссылка на
+    документ, номер и название.
+    """
+
+    abbr: str
+    href: str
+    number: str
+    title: str
+
+
+def not_found(tag: str, attrs: Optional[dict] = None, string: str = None):
+    """Возвращает исключение о ненайденном теге."""
+    return ParserFindTagException(
+        NOT_FIND_TAG_ERROR.format(tag=tag, attrs=attrs, string=string)
+    )
+
+
+class SoupParser:
+    """Парсер на основе BeautifulSoup с заданным внутренним парсером."""
+
+    def __init__(self, name: str, features: str) -> None:
+        self.name = name
+        self.features = features
+
+    def parse(self, html: str) -> Any:
+        """Разбирает HTML страницу."""
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(html, features=self.features)
+
+    def whats_new_links(self, document: Any) -> List[str]:
+        """Возвращает ссылки на статьи о нововведениях."""
+        from patterns import WHATS_NEW_LINKS
+
+        return [a_tag['href'] for a_tag in WHATS_NEW_LINKS.select(document)]
+
+    def whats_new_article(self, document: Any) -> Tuple[str, str]:
+        """Возвращает заголовок статьи и её авторов и редакторов."""
+        return (
+            find_tag(document, 'h1').text,
+            find_tag(document, 'dl').text.replace('\n', ' ')
+        )
+
+    def python_versions(self, document: Any) -> List[Tuple[str, str]]:
+        """Возвращает ссылки и подписи из списка версий Python."""
+        from patterns import SIDEBAR_LISTS
+
+        for ul in SIDEBAR_LISTS.select(document):
+            if ALL_VERSIONS in ul.text:
+                return [
+                    (a_tag['href'], a_tag.text)
+                    for a_tag in ul.find_all(name='a')
+                ]
+        raise not_found('ul')
+
+    def pdf_a4_link(self, document: Any) -> str:
+        """Возвращает ссылку на архив документации в формате PDF A4."""
+        from patterns import PDF_A4_LINK
+
+        pdf_a4_tag = PDF_A4_LINK.select_one(document)
+        if pdf_a4_tag is None:
+            raise not_found('a', {'href$': PDF_A4_SUFFIX})
+        return pdf_a4_tag['href']
+
+    def pep_rows(self, document: Any) -> List[PepRow]:
+        """Возвращает строки таблицы PEP 0."""
+        from patterns import PEP_ROWS
+
+        rows = []
+        for row in PEP_ROWS.select(document):
+            abbr_tag = find_tag(row, 'abbr')
+            a_tags = row.find_all('a', limit=2)
+            if not a_tags:
+                raise not_found('a')
+            number_tag, *title_tags = a_tags
+            rows.append(PepRow(
+                abbr_tag.text,
+                number_tag['href'],
+                number_tag.text,
+                title_tags[0].text if title_tags else ''
+            ))
+        return rows
+
+    def pep_status(self, document: Any) -> str:
+        """Возвращает статус документа со страницы PEP."""
+        from patterns import PEP_STATUS_FIELD
+
+        return find_tag(
+            find_tag(
+                document,
+                string=PEP_STATUS_FIELD,
+                find_type=find_tag_by_string
+            ),
+            find_type=find_next_sibling
+        ).text
+
+
+class LxmlParser:
+    """Парсер на основе lxml.html без BeautifulSoup.
+    Элементы ищутся скомпилированными выражениями XPath.
+    """
+
+    name = PARSER_LXML_HTML
+
+    def __init__(self) -> None:
+        from lxml import etree
+
+        self.whats_new_links_path = etree.XPath(
+            '//*[@id="what-s-new-in-python"]'
+            '//div[contains(concat(" ", @class, " "), " toctree-wrapper ")]'
+            '//li[contains(concat(" ", @class, " "), " toctree-l1 ")]'
+            '/a[not(@href="changelog.html")]/@href'
+        )
+        self.first_h1_path = etree.XPath('(//h1)[1]')
+        self.first_dl_path = etree.XPath('(//dl)[1]')
+        self.sidebar_lists_path = etree.XPath(
+            '//div[contains(concat(" ", @class, " "), '
+            '" sphinxsidebarwrapper ")]//ul'
+        )
+        self.pdf_a4_link_path = etree.XPath(
+            '//div[@role="main"]'
+            '//table[contains(concat(" ", @class, " "), " docutils ")]'
+            '//a[substring(@href, string-length(@href) - $length + 1)'
+            ' = $suffix]/@href'
+        )
+        self.pep_rows_path = etree.XPath(
+            '//*[@id="numerical-index"]'
+            '//table[contains(concat(" ", @class, " "), " pep-zero-table ")]'
+            '//tbody//tr'
+        )
+        self.pep_status_path = etree.XPath(
+            '(//text()[contains(., $field)])[1]/..'
+            '/following-sibling::*[1]'
+        )
+
+    def parse(self, html: str) -> Any:
+        """Разбирает HTML страницу."""
+        import lxml.html
+
+        return lxml.html.document_fromstring(html)
+
+    def whats_new_links(self, document: Any) -> List[str]:
+        """Возвращает ссылки на статьи о нововведениях."""
+        return [str(href) for href in self.whats_new_links_path(document)]
+
+    def whats_new_article(self, document: Any) -> Tuple[str, str]:
+        """Возвращает заголовок статьи и её авторов и редакторов."""
+        h1_tags = self.first_h1_path(document)
+        if not h1_tags:
+            raise not_found('h1')
+        dl_tags = self.first_dl_path(document)
+        if not dl_tags:
+            raise not_found('dl')
+        return (
+            h1_tags[0].text_content(),
+            dl_tags[0].text_content().replace('\n', ' ')
+        )
+
+    def python_versions(self, document: Any) -> List[Tuple[str, str]]:
+        """Возвращает ссылки и подписи из списка версий Python."""
+        for ul in self.sidebar_lists_path(document):
+            if ALL_VERSIONS in ul.text_content():
+                return [
+                    (a_tag.get('href'), a_tag.text_content())
+                    for a_tag in ul.iter('a')
+                ]
+        raise not_found('ul')
+
+    def pdf_a4_link(self, document: Any) -> str:
+        """Возвращает ссылку на архив документации в формате PDF A4."""
+        links = self.pdf_a4_link_path(
+            document, length=len(PDF_A4_SUFFIX), suffix=PDF_A4_SUFFIX
+        )
+        if not links:
+            raise not_found('a', {'href$': PDF_A4_SUFFIX})
+        return str(links[0])
+
+    def pep_rows(self, document: Any) -> List[PepRow]:
+        """Возвращает строки таблицы PEP 0."""
+        rows = []
+        for row in self.pep_rows_path(document):
+            abbr_tag = next(row.iter('abbr'), None)
+            if abbr_tag is None:
+                raise not_found('abbr')
+            a_tags = list(row.iter('a'))[:2]
+            if not a_tags:
+                raise not_found('a')
+            number_tag, *title_tags = a_tags
+            rows.append(PepRow(
+                abbr_tag.text_content(),
+                number_tag.get('href'),
+                number_tag.text_content(),
+                title_tags[0].text_content() if title_tags else ''
+            ))
+        return rows
+
+    def pep_status(self, document: Any) -> str:
+        """Возвращает статус документа со страницы PEP."""
+        status_tags = self.pep_status_path(document, field=STATUS_FIELD)
+        if not status_tags:
+            raise not_found(None, string=STATUS_FIELD)
+        return status_tags[0].text_content()
+
+
+class SelectolaxParser:
+    """Парсер на основе selectolax (lexbor), если пакет установлен."""
+
+    name = PARSER_SELECTOLAX
+
+    def __init__(self) -> None:
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            raise MissingDependencyException(SELECTOLAX_NOT_INSTALLED)
+        self.html_parser = LexborHTMLParser
+
+    def parse(self, html: str) -> Any:
+        """Разбирает HTML страницу."""
+        return self.html_parser(html)
+
+    @staticmethod
+    def css_first(node: Any, selector: str, tag: str) -> Any:
+        """Возвращает первый подходящий узел или выбрасывает исключение."""
+        found = node.css_first(selector)
+        if found is None:
+            raise not_found(tag)
+        return found
+
+    def whats_new_links(self, document: Any) -> List[str]:
+        """Возвращает ссылки на статьи о нововведениях."""
+        from patterns import WHATS_NEW_LINKS_SELECTOR
+
+        return [
+            a_tag.attributes['href']
+            for a_tag in document.css(WHATS_NEW_LINKS_SELECTOR)
+        ]
+
+    def whats_new_article(self, document: Any) -> Tuple[str, str]:
+        """Возвращает заголовок статьи и её авторов и редакторов."""
+        return (
+            self.css_first(document, 'h1', 'h1').text(),
+            self.css_first(document, 'dl', 'dl').text().replace('\n', ' ')
+        )
+
+    def python_versions(self, document: Any) -> List[Tuple[str, str]]:
+        """Возвращает ссылки и подписи из списка версий Python."""
+        from patterns import SIDEBAR_LISTS_SELECTOR
+
+        for ul in document.css(SIDEBAR_LISTS_SELECTOR):
+            if ALL_VERSIONS in ul.text():
+                return [
+                    (a_tag.attributes['href'], a_tag.text())
+                    for a_tag in ul.css('a')
+                ]
+        raise not_found('ul')
+
+    def pdf_a4_link(self, document: Any) -> str:
+        """Возвращает ссылку на архив документации в формате PDF A4."""
+        from patterns import PDF_A4_LINK_SELECTOR
+
+        pdf_a4_tag = document.css_first(PDF_A4_LINK_SELECTOR)
+        if pdf_a4_tag is None:
+            raise not_found('a', {'href$': PDF_A4_SUFFIX})
+        return pdf_a4_tag.attributes['href']
+
+    def pep_rows(self, document: Any) -> List[PepRow]:
+        """Возвращает строки таблицы PEP 0."""
+        from patterns import PEP_ROWS_SELECTOR
+
+        rows = []
+        for row in document.css(PEP_ROWS_SELECTOR):
+            abbr_tag = self.css_first(row, 'abbr', 'abbr')
+            number_tag = self.css_first(row, 'a', 'a')
+            title_tags = row.css('a')[1:2]
+            rows.append(PepRow(
+                abbr_tag.text(),
+                number_tag.attributes['href'],
+                number_tag.text(),
+                title_tags[0].text() if title_tags else ''
+            ))
+        return rows
+
+    def pep_status(self, document: Any) -> str:
+        """Возвращает статус документа со страницы PEP."""
+        for node in document.root.traverse(include_text=True):
+            if node.is_text_node and STATUS_FIELD in node.text_content:
+                sibling = node.parent.next
+                while sibling is not None and not sibling.is_element_node:
+                    sibling = sibling.next
+                if sibling is not None:
+                    return sibling.text()
+                break
+        raise not_found(None, string=STATUS_FIELD)
+
+
+PARSER_TO_FACTORY = {
+    PARSER_LXML: lambda: SoupParser(PARSER_LXML, 'lxml'),
+    PARSER_HTML: lambda: SoupParser(PARSER_HTML, 'html.parser'),
+    PARSER_LXML_HTML: LxmlParser,
+    PARSER_SELECTOLAX: SelectolaxParser,
+}
+
+
+def create_parser(name: str) -> Any:
+    """Создаёт парсер по имени.
+
+    Параметры:
+        name: Имя парсера.
+    """
+    return PARSER_TO_FACTORY[name]()
+
+
+def available_parsers() -> List[Any]:
+    """Возвращает парсеры, зависимости которых установлены."""
+    parsers = []
+    for name in PARSER_TO_FACTORY:
+        try:
+            parsers.append(create_parser(name))
+        except MissingDependencyException:
+            continue
+    return parsers
+
+
+def load_calibration() -> Dict[str, str]:
+    """Возвращает выбранные калибровкой парсеры для режимов работы."""
+    try:
+        with open(BASE_DIR / PARSERS_FILE, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_calibration(mode_to_parser: Dict[str, str]) -> None:
+    """Сохраняет выбранные калибровкой парсеры для режимов работы.
+
+    Параметры:
+        mode_to_parser: Имена парсеров по режимам работы.
+    """
+    with open(BASE_DIR / PARSERS_FILE, 'w', encoding='utf-8') as file:
+        json.dump(mode_to_parser, file, ensure_ascii=False, indent=4)
+
+
+def parser_name(cli_args: Namespace) -> str:
+    """Возвращает имя парсера для режима работы.
+    Если парсер не указан явно, берётся выбранный калибровкой для режима,
+    а при его отсутствии - парсер по умолчанию.
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+    """
+    if cli_args.parser == PARSER_AUTO:
+        return load_calibration().get(cli_args.mode, DEFAULT_PARSER)
+    return cli_args.parser
+
+
+def get_parser(cli_args: Namespace) -> Any:
+    """Возвращает парсер для режима работы (см. parser_name).
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+    """
+    return create_parser(parser_name(cli_args))
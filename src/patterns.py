@@ -0,0 +1,30 @@
+"""Скомпилированные CSS-селекторы и регулярные выражения для извлечения
+данных со страниц документации Python и PEP.
+
+Исходные строки CSS-селекторов - единый реестр для всех парсеров: парсеры
+без BeautifulSoup используют их напрямую. Селекторы и выражения
+компилируются один раз при импорте модуля. Модуль импортирует soupsieve
+(и вместе с ним bs4), поэтому его следует импортировать только в
+функциях, которые разбирают страницы.
+"""
+import re
+
+import soupsieve
+
+WHATS_NEW_LINKS_SELECTOR = (
+    '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > '
+    'a:not([href="changelog.html"])'
+)
+SIDEBAR_LISTS_SELECTOR = 'div.sphinxsidebarwrapper ul'
+PDF_A4_LINK_SELECTOR = 'div[role="main"] table.docutils a[href$="pdf-a4.zip"]'
+PEP_ROWS_SELECTOR = '#numerical-index table.pep-zero-table tbody tr'
+
+WHATS_NEW_LINKS = soupsieve.compile(WHATS_NEW_LINKS_SELECTOR)
+SIDEBAR_LISTS = soupsieve.compile(SIDEBAR_LISTS_SELECTOR)
+PDF_A4_LINK = soupsieve.compile(PDF_A4_LINK_SELECTOR)
+PEP_ROWS = soupsieve.compile(PEP_ROWS_SELECTOR)
+
+VERSION_STATUS = re.compile(
+    r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+)
+PEP_STATUS_FIELD = re.compile('Status')
@@ -0,0 +1,126 @@
+"""Локальный индекс документов PEP в базе SQLite.
+
+Режим pep сохраняет в индекс номер, название, тип, статус из таблицы PEP 0
+и статус со страницы каждого обработанного документа. Команда query
+отвечает на запросы по индексу без обращения к сети.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import sqlite3
+from argparse import Namespace
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple
+
+from constants import BASE_DIR, OUTPUT_BATCH_SIZE, PEP_INDEX_FILE
+from exceptions import MissingPepIndexException
+from outputs import batched
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+PepRecord = Tuple[int, str, str, str, str, bool, str]
+
+PEP_INDEX_COLUMN_HEADERS = (
+    'Номер', 'Название', 'Тип', 'Статус в PEP 0', 'Статус в карточке',
+    'Ссылка'
+)
+PEP_INDEX_SAVED = 'Индекс PEP {file_path} обновлён, документов: {count}'
+PEP_INDEX_NOT_FOUND = (
+    'Индекс PEP {file_path} не найден, сначала запустите режим pep'
+)
+CREATE_PEPS_SQL = (
+    'CREATE TABLE IF NOT EXISTS peps ('
+    'number INTEGER PRIMARY KEY, title TEXT NOT NULL, type TEXT NOT NULL, '
+    'index_status TEXT NOT NULL, page_status TEXT NOT NULL, '
+    'mismatch INTEGER NOT NULL, url TEXT NOT NULL, updated_at TEXT NOT NULL)'
+)
+CREATE_PEPS_INDEXES_SQL = (
+    'CREATE INDEX IF NOT EXISTS peps_page_status '
+    'ON peps (page_status COLLATE NOCASE)',
+    'CREATE INDEX IF NOT EXISTS peps_type ON peps (type)',
+    'CREATE INDEX IF NOT EXISTS peps_mismatch ON peps (mismatch)',
+)
+UPSERT_PEP_SQL = 'INSERT OR REPLACE INTO peps VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+SELECT_PEPS_SQL = (
+    'SELECT number, title, type, index_status, page_status, url '
+    'FROM peps{where} ORDER BY number'
+)
+
+
+def save_pep_index(records: Iterable[PepRecord]) -> None:
+    """Добавляет или обновляет документы в индексе PEP.
+
+    Параметры:
+        records: Номер, название, тип, статус в PEP 0, статус в карточке,
+            признак несовпадения статусов и ссылка на документ.
+    """
+    updated_at = dt.datetime.now().isoformat(sep=' ', timespec='seconds')
+    file_path = BASE_DIR / PEP_INDEX_FILE
+    connection = sqlite3.connect(file_path)
+    count = 0
+    try:
+        with connection:
+            connection.execute(CREATE_PEPS_SQL)
+            for create_index_sql in CREATE_PEPS_INDEXES_SQL:
+                connection.execute(create_index_sql)
+            for batch in batched(records, OUTPUT_BATCH_SIZE):
+                connection.executemany(
+                    UPSERT_PEP_SQL,
+                    ((*record, updated_at) for record in batch)
+                )
+                count += len(batch)
+    finally:
+        connection.close()
+    logging.info(PEP_INDEX_SAVED.format(file_path=file_path, count=count))
+
+
+def query_conditions(cli_args: Namespace) -> Tuple[str, List[object]]:
+    """Возвращает условие WHERE и его параметры по фильтрам запроса.
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+    """
+    conditions, parameters = [], []
+    if cli_args.status:
+        conditions.append('page_status = ? COLLATE NOCASE')
+        parameters.append(cli_args.status)
+    if cli_args.type:
+        conditions.append('type = ?')
+        parameters.append(cli_args.type.upper())
+    if cli_args.mismatch:
+        conditions.append('mismatch = 1')
+    if cli_args.numbers:
+        conditions.append('number BETWEEN ? AND ?')
+        parameters.extend(cli_args.numbers)
+    if not conditions:
+        return '', parameters
+    return ' WHERE ' + ' AND '.join(conditions), parameters
+
+
+def query(
+    session: CachedSession,
+    cli_args: Namespace
+) -> Iterator[Tuple[object, ...]]:
+    """Выбирает документы из индекса PEP без обращения к сети.
+    Фильтры: --status (статус в карточке), --type (тип документа),
+    --mismatch (статусы не совпадают) и --numbers (диапазон номеров).
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+    """
+    file_path = BASE_DIR / PEP_INDEX_FILE
+    if not file_path.exists():
+        raise MissingPepIndexException(
+            PEP_INDEX_NOT_FOUND.format(file_path=file_path)
+        )
+    where, parameters = query_conditions(cli_args)
+    connection = sqlite3.connect(file_path)
+    try:
+        yield PEP_INDEX_COLUMN_HEADERS
+        yield from connection.execute(
+            SELECT_PEPS_SQL.format(where=where), parameters
+        )
+    finally:
+        connection.close()
@@ -0,0 +1,510 @@
+"""Конвейер обхода страниц с ограниченными очередями между стадиями.
+
+Конвейер состоит из источника заданий и последовательности стадий. Каждая
+стадия выполняется заданным числом потоков и передаёт результаты следующей
+стадии через очередь ограниченного размера: если следующая стадия не
+успевает, предыдущая ждёт (обратное давление). Результаты последней стадии
+отдаются генератором в порядке заданий источника. Источник передаёт
+задание, только если оно попадает в окно порядка: заданий, уже взятых из
+источника, но ещё не отданных генератором, не больше размера очереди и
+числа всех потоков стадий вместе. Поэтому одна медленная страница в
+начале обхода не позволяет остальным накопиться в памяти.
+
+Стандартный обход страниц: ссылки со страницы-индекса -> загрузка ->
+разбор -> извлечение данных -> потребитель результатов (см. crawl).
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from argparse import Namespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+from checkpoint import Journal, checkpoint_journal
+from constants import PIPELINE_POLL_INTERVAL, PIPELINE_QUEUE_SIZE
+from memo import MISSING, ExtractionCache, get_extraction_cache
+from utils import get_response
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+STAGE_WORKERS_ERROR = (
+    'Число потоков стадии должно быть не меньше 1: {workers}'
+)
+BUDGET_MAX_PAGES = 'достигнут лимит страниц {max_pages}'
+BUDGET_DEADLINE = 'истёк срок {deadline} с'
+BUDGET_EXHAUSTED = (
+    'Загрузка новых страниц остановлена: {reason}. Результаты частичные'
+)
+PARTIAL_RESULT = 'Частичный результат'
+
+DROP = object()
+FINISHED = object()
+
+Task = Tuple[str, Any]
+
+
+class Stage(NamedTuple):
+    """Стадия конвейера: функция обработки одного задания и число потоков
+    (не меньше 1). Функция может вернуть DROP, чтобы исключить задание из
+    результатов.
+    """
+
+    function: Callable[[Any], Any]
+    workers: int = 1
+
+
+class Pipeline:
+    """Потоки и очереди одного запуска конвейера."""
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        stages: Sequence[Stage],
+        queue_size: int
+    ) -> None:
+        for stage in stages:
+            if stage.workers < 1:
+                raise ValueError(
+                    STAGE_WORKERS_ERROR.format(workers=stage.workers)
+                )
+        self.source = source
+        self.stages = stages
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.errors: List[BaseException] = []
+        self.queues = [
+            queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)
+        ]
+        self.running = [stage.workers for stage in stages]
+        self.window = threading.Semaphore(
+            queue_size + sum(stage.workers for stage in stages)
+        )
+        self.consumers = [stage.workers for stage in stages] + [1]
+        self.threads = [threading.Thread(target=self.feed, daemon=True)] + [
+            threading.Thread(target=self.work, args=(number,), daemon=True)
+            for number, stage in enumerate(stages)
+            for _ in range(stage.workers)
+        ]
+
+    def put(self, outbox: queue.Queue, item: Any) -> bool:
+        """Кладёт элемент в очередь, пока конвейер не остановлен."""
+        while not self.stop.is_set():
+            try:
+                outbox.put(item, timeout=PIPELINE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, inbox: queue.Queue) -> Any:
+        """Берёт элемент из очереди или FINISHED, если конвейер остановлен."""
+        while not self.stop.is_set():
+            try:
+                return inbox.get(timeout=PIPELINE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return FINISHED
+
+    def admit(self) -> bool:
+        """Ждёт места в окне порядка, пока конвейер не остановлен."""
+        while not self.stop.is_set():
+            if self.window.acquire(timeout=PIPELINE_POLL_INTERVAL):
+                return True
+        return False
+
+    def fail(self, error: BaseException) -> None:
+        """Запоминает ошибку и останавливает конвейер."""
+        self.errors.append(error)
+        self.stop.set()
+
+    def finish(self, number: int) -> None:
+        """Сообщает потокам стадии number, что заданий больше не будет."""
+        for _ in range(self.consumers[number]):
+            self.put(self.queues[number], FINISHED)
+
+    def feed(self) -> None:
+        """Передаёт задания источника первой стадии."""
+        try:
+            for index, task in enumerate(self.source):
+                if not self.admit():
+                    return
+                if not self.put(self.queues[0], (index, task)):
+                    return
+        except Exception as error:
+            self.fail(error)
+        self.finish(0)
+
+    def work(self, number: int) -> None:
+        """Обрабатывает задания стадии number."""
+        function = self.stages[number].function
+        inbox, outbox = self.queues[number], self.queues[number + 1]
+        try:
+            while True:
+                item = self.get(inbox)
+                if item is FINISHED:
+                    break
+                index, task = item
+                if task is not DROP:
+                    task = function(task)
+                if not self.put(outbox, (index, task)):
+                    break
+        except Exception as error:
+            self.fail(error)
+        with self.lock:
+            self.running[number] -= 1
+            last = not self.running[number]
+        if last:
+            self.finish(number + 1)
+
+    def results(self) -> Iterator[Any]:
+        """Отдаёт результаты последней стадии в порядке заданий."""
+        pending: Dict[int, Any] = {}
+        next_index = 0
+        while True:
+            item = self.get(self.queues[-1])
+            if item is FINISHED:
+                break
+            index, result = item
+            pending[index] = result
+            while next_index in pending:
+                result = pending.pop(next_index)
+                next_index += 1
+                self.window.release()
+                if result is not DROP:
+                    yield result
+        if self.errors:
+            raise self.errors[0]
+
+
+def run_pipeline(
+    source: Iterable[Any],
+    stages: Sequence[Stage],
+    queue_size: int = PIPELINE_QUEUE_SIZE
+) -> Iterator[Any]:
+    """Пропускает задания источника через стадии конвейера.
+    Результаты отдаются в порядке заданий источника, исключённые задания
+    пропускаются. Ошибка в любой стадии останавливает конвейер и
+    выбрасывается из генератора. Если генератор закрыт раньше времени,
+    потоки конвейера останавливаются.
+
+    Параметры:
+        source: Задания для первой стадии.
+        stages: Стадии конвейера.
+        queue_size: Размер очереди между стадиями.
+    """
+    pipeline = Pipeline(source, stages, queue_size)
+    for thread in pipeline.threads:
+        thread.start()
+    try:
+        yield from pipeline.results()
+    finally:
+        pipeline.stop.set()
+        for thread in pipeline.threads:
+            thread.join()
+
+
+class Budget:
+    """Ограничение обхода по времени (--deadline) и числу страниц
+    (--max-pages). Срок отсчитывается от создания ограничения. Число
+    страниц ограничивается при постановке заданий в очередь, срок - ещё и
+    перед началом каждой загрузки, поэтому после его истечения
+    завершаются только уже начатые загрузки.
+    """
+
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        max_pages: Optional[int] = None
+    ) -> None:
+        self.deadline = deadline
+        self.finish_at = (
+            None if deadline is None else time.monotonic() + deadline
+        )
+        self.max_pages = max_pages
+        self.scheduled = 0
+        self.reason: Optional[str] = None
+        self.lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        """Был ли обход остановлен из-за ограничения."""
+        return self.reason is not None
+
+    @property
+    def expired(self) -> bool:
+        """Истёк ли срок обхода."""
+        return (
+            self.finish_at is not None and time.monotonic() >= self.finish_at
+        )
+
+    def check(self) -> Optional[str]:
+        """Возвращает причину остановки, если ограничение достигнуто."""
+        if self.max_pages is not None and self.scheduled >= self.max_pages:
+            return BUDGET_MAX_PAGES.format(max_pages=self.max_pages)
+        if self.expired:
+            return BUDGET_DEADLINE.format(deadline=self.deadline)
+        return None
+
+    def stop(self, reason: str) -> None:
+        """Отмечает обход как остановленный и один раз логирует причину.
+
+        Параметры:
+            reason: Причина остановки.
+        """
+        with self.lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+        logging.warning(BUDGET_EXHAUSTED.format(reason=reason))
+
+    def allows_fetch(self) -> bool:
+        """Проверяет перед началом загрузки страницы, не истёк ли срок."""
+        if not self.expired:
+            return True
+        self.stop(BUDGET_DEADLINE.format(deadline=self.deadline))
+        return False
+
+    def partial_row(self, header: Sequence[str]) -> Tuple[str, ...]:
+        """Возвращает строку, отмечающую результаты как частичные.
+
+        Параметры:
+            header: Шапка таблицы режима.
+        """
+        return (PARTIAL_RESULT, self.reason, *[''] * (len(header) - 2))
+
+    def limit(
+        self,
+        tasks: Iterable[Task],
+        done: Dict[str, Any]
+    ) -> Iterator[Task]:
+        """Передаёт задания, пока ограничение не достигнуто.
+        Страницы из журнала контрольных точек не загружаются и в
+        ограничении не учитываются.
+
+        Параметры:
+            tasks: Задания обхода.
+            done: Данные страниц, обработанных до прерывания обхода.
+        """
+        for task in tasks:
+            if task[0] not in done:
+                reason = self.check()
+                if reason is not None:
+                    self.stop(reason)
+                    return
+                self.scheduled += 1
+            yield task
+
+
+class Page:
+    """Страница, проходящая через стадии обхода."""
+
+    __slots__ = ('url', 'context', 'text', 'key', 'document', 'data')
+
+    def __init__(self, url: str, context: Any, text: str) -> None:
+        self.url = url
+        self.context = context
+        self.text = text
+        self.key = None
+        self.document = None
+        self.data = MISSING
+
+
+def fetch_stage(
+    session: CachedSession,
+    workers: int,
+    done: Dict[str, Any],
+    budget: Optional[Budget] = None
+) -> Stage:
+    """Стадия загрузки страниц.
+    Получает задание (url, контекст) и передаёт дальше страницу с HTML.
+    Страницы, данные которых есть в журнале контрольных точек, не
+    загружаются. Недоступные страницы логируются и исключаются. Задания,
+    взятые из очереди после истечения срока обхода, исключаются без
+    загрузки.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        workers: Число потоков загрузки.
+        done: Данные страниц, обработанных до прерывания обхода.
+        budget: Ограничение обхода или None.
+    """
+    def fetch(task: Task) -> Any:
+        url, context = task
+        if url in done:
+            page = Page(url, context, None)
+            page.data = done[url]
+            return page
+        if budget is not None and not budget.allows_fetch():
+            return DROP
+        try:
+            return Page(url, context, get_response(session, url).text)
+        except ConnectionError as error:
+            logging.error(
+                str(error),
+                extra={'url': url}
+            )
+            return DROP
+
+    return Stage(fetch, workers)
+
+
+def parse_stage(
+    parser: Any,
+    method: str,
+    cache: ExtractionCache,
+    workers: int = 1
+) -> Stage:
+    """Стадия разбора страниц.
+    Если данные страницы с таким же содержимым уже есть в кеше извлечения,
+    страница не разбирается.
+
+    Параметры:
+        parser: Парсер из модуля parsers.
+        method: Имя метода парсера, извлекающего данные.
+        cache: Кеш извлечения.
+        workers: Число потоков разбора.
+    """
+    def parse(page: Page) -> Page:
+        if page.data is not MISSING:
+            return page
+        page.key = cache.key(parser.name, method, page.text)
+        page.data = cache.get(page.key)
+        if page.data is MISSING:
+            page.document = parser.parse(page.text)
+        page.text = None
+        return page
+
+    return Stage(parse, workers)
+
+
+def extract_stage(
+    parser: Any,
+    method: str,
+    build: Callable[[str, Any, Any], Any],
+    cache: ExtractionCache,
+    journal: Optional[Journal] = None,
+    workers: int = 1
+) -> Stage:
+    """Стадия извлечения данных и сборки строки результата.
+    Данные новых страниц записываются в журнал контрольных точек, если он
+    передан.
+
+    Параметры:
+        parser: Парсер из модуля parsers.
+        method: Имя метода парсера, извлекающего данные.
+        build: Функция сборки строки результата: получает url, контекст и
+            извлечённые данные.
+        cache: Кеш извлечения.
+        journal: Журнал контрольных точек или None.
+        workers: Число потоков извлечения.
+    """
+    extract = getattr(parser, method)
+
+    def extract_page(page: Page) -> Any:
+        if page.data is MISSING:
+            page.data = extract(page.document)
+            cache.put(page.key, page.data)
+            page.document = None
+        if journal is not None and page.url not in journal.done:
+            journal.record(page.url, page.data)
+        return build(page.url, page.context, page.data)
+
+    return Stage(extract_page, workers)
+
+
+def crawl_pages(
+    session: CachedSession,
+    parser: Any,
+    tasks: Iterable[Task],
+    method: str,
+    build: Callable[[str, Any, Any], Any],
+    workers: int,
+    cache: ExtractionCache,
+    journal: Optional[Journal] = None,
+    budget: Optional[Budget] = None
+) -> Iterator[Any]:
+    """Пропускает страницы через стадии загрузки, разбора и извлечения.
+    Загрузка выполняется workers потоками, разбор и извлечение - одним
+    потоком каждая: они заняты процессором, и из-за GIL дополнительные
+    потоки их не ускоряют. Число потоков каждой стадии отдельно задаётся
+    при сборке конвейера через run_pipeline.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        parser: Парсер из модуля parsers.
+        tasks: Пары из url страницы и контекста, нужного для сборки строки.
+        method: Имя метода парсера, извлекающего данные со страницы.
+        build: Функция сборки строки результата: получает url, контекст и
+            извлечённые данные.
+        workers: Число потоков загрузки.
+        cache: Кеш извлечения.
+        journal: Журнал контрольных точек или None.
+        budget: Ограничение обхода или None: после истечения срока новые
+            загрузки не начинаются.
+    """
+    return run_pipeline(tasks, (
+        fetch_stage(
+            session, workers, journal.done if journal else {}, budget
+        ),
+        parse_stage(parser, method, cache),
+        extract_stage(parser, method, build, cache, journal),
+    ))
+
+
+def crawl(
+    session: CachedSession,
+    parser: Any,
+    tasks: Iterable[Task],
+    method: str,
+    build: Callable[[str, Any, Any], Any],
+    cli_args: Namespace,
+    budget: Budget
+) -> Iterator[Any]:
+    """Загружает, разбирает страницы и извлекает из них данные.
+    Извлечённые данные кешируются по содержимому страниц, а при включённой
+    опции --extraction-cache кеш сохраняется на диск после обхода.
+    Обработанные страницы записываются в журнал контрольных точек, с опцией
+    --resume обход продолжается с последней контрольной точки. Когда
+    ограничение обхода достигнуто, новые страницы не загружаются, уже
+    начатые обрабатываются, а журнал сохраняется для --resume.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        parser: Парсер из модуля parsers.
+        tasks: Пары из url страницы и контекста, нужного для сборки строки.
+        method: Имя метода парсера, извлекающего данные со страницы.
+        build: Функция сборки строки результата: получает url, контекст и
+            извлечённые данные.
+        cli_args: Аргументы командной строки.
+        budget: Ограничение обхода.
+    """
+    cache = get_extraction_cache(cli_args.extraction_cache)
+    with checkpoint_journal(cli_args) as journal:
+        yield from crawl_pages(
+            session,
+            parser,
+            budget.limit(tasks, journal.done),
+            method,
+            build,
+            cli_args.workers,
+            cache,
+            journal,
+            budget
+        )
+        journal.keep = budget.exhausted
+    cache.save()
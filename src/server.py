@@ -0,0 +1,183 @@
+"""Режим serve: локальный HTTP-сервер с результатами режимов работы.
+
+Результаты режимов хранятся в памяти уже сериализованными в JSON, поэтому
+запрос отдаёт готовые байты без обхода сайтов. Отдельный поток обновляет
+результаты по расписанию, ответы сайтов при этом перепроверяются
+условными запросами (ETag, Last-Modified), и неизменившиеся страницы не
+загружаются заново.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+import threading
+from argparse import Namespace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+ModeFunction = Callable[..., Iterable[Tuple[str, ...]]]
+
+SERVER_STARTED = 'Сервер запущен: http://{host}:{port}/'
+SERVER_STOPPED = 'Сервер остановлен'
+RESULTS_REFRESHED = 'Результаты режима {mode} обновлены, строк: {count}'
+REFRESH_ERROR = 'Сбой при обновлении режима {mode}: {error}'
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+def to_json(data: object) -> bytes:
+    """Сериализует данные ответа в JSON."""
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class ResultsStore:
+    """Сериализованные результаты режимов работы."""
+
+    def __init__(self, modes: Iterable[str]) -> None:
+        self.lock = threading.Lock()
+        self.updated_at: Dict[str, Optional[str]] = dict.fromkeys(modes)
+        self.responses: Dict[str, bytes] = {}
+        self.index = to_json({'modes': self.updated_at})
+
+    def update(self, mode: str, rows: Iterable[Tuple[str, ...]]) -> None:
+        """Заменяет результаты режима.
+
+        Параметры:
+            mode: Режим работы.
+            rows: Строки результатов, первая - шапка таблицы.
+        """
+        rows = iter(rows)
+        columns = next(rows)
+        updated_at = dt.datetime.now().isoformat(timespec='seconds')
+        response = to_json({
+            'mode': mode,
+            'updated_at': updated_at,
+            'columns': columns,
+            'rows': list(rows),
+        })
+        with self.lock:
+            self.responses[mode] = response
+            self.updated_at = {**self.updated_at, mode: updated_at}
+            self.index = to_json({'modes': self.updated_at})
+
+    def get(self, path: str) -> Tuple[HTTPStatus, bytes]:
+        """Возвращает статус и тело ответа на запрос.
+
+        Параметры:
+            path: Путь запроса: / - список режимов, /<режим> - результаты.
+        """
+        mode = path.strip('/')
+        if not mode:
+            return HTTPStatus.OK, self.index
+        if mode not in self.updated_at:
+            return HTTPStatus.NOT_FOUND, to_json({'error': 'unknown mode'})
+        response = self.responses.get(mode)
+        if response is None:
+            return (
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                to_json({'error': 'results are not ready yet'})
+            )
+        return HTTPStatus.OK, response
+
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов к результатам режимов."""
+
+    def do_GET(self) -> None:
+        status, body = self.server.store.get(self.path.split('?')[0])
+        self.send_response(status)
+        self.send_header('Content-Type', JSON_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        logging.debug(format, *args)
+
+
+def create_server(
+    host: str,
+    port: int,
+    store: ResultsStore
+) -> ThreadingHTTPServer:
+    """Создаёт HTTP-сервер, отдающий результаты из хранилища.
+
+    Параметры:
+        host: Адрес, на котором сервер принимает запросы.
+        port: Порт сервера, 0 - любой свободный.
+        store: Хранилище результатов.
+    """
+    server = ThreadingHTTPServer((host, port), ResultsHandler)
+    server.daemon_threads = True
+    server.store = store
+    return server
+
+
+def refresh(
+    session: CachedSession,
+    cli_args: Namespace,
+    modes: Dict[str, ModeFunction],
+    store: ResultsStore
+) -> None:
+    """Обновляет результаты всех режимов.
+    Сбой режима логируется, прежние результаты режима сохраняются.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+        modes: Режимы работы и их функции.
+        store: Хранилище результатов.
+    """
+    for mode, function in modes.items():
+        try:
+            rows = list(function(session, Namespace(**{
+                **vars(cli_args), 'mode': mode, 'command': cli_args.mode
+            })))
+        except Exception as error:
+            logging.exception(REFRESH_ERROR.format(mode=mode, error=error))
+            continue
+        store.update(mode, rows)
+        logging.info(RESULTS_REFRESHED.format(mode=mode, count=len(rows) - 1))
+
+
+def run_server(
+    session: CachedSession,
+    cli_args: Namespace,
+    modes: Dict[str, ModeFunction]
+) -> None:
+    """Запускает сервер и обновление результатов по расписанию.
+    Работает до прерывания с клавиатуры.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+        modes: Режимы работы и их функции.
+    """
+    session.settings.always_revalidate = True
+    store = ResultsStore(modes)
+    stop = threading.Event()
+
+    def refresh_periodically() -> None:
+        while True:
+            refresh(session, cli_args, modes, store)
+            if stop.wait(cli_args.refresh):
+                return
+
+    refresher = threading.Thread(target=refresh_periodically, daemon=True)
+    refresher.start()
+    server = create_server(cli_args.host, cli_args.port, store)
+    logging.info(SERVER_STARTED.format(
+        host=cli_args.host, port=server.server_address[1]
+    ))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        logging.info(SERVER_STOPPED)
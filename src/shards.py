@@ -0,0 +1,170 @@
+"""Распределение режима pep по нескольким запускам.
+
+Строки таблицы PEP 0 детерминированно делятся на N частей по контрольной
+сумме ссылки на документ, поэтому каждый узел с опцией --shard i/N
+обрабатывает свою часть независимо от остальных. Частичные результаты
+сохраняются в файл, а команда merge собирает из файлов всех частей итоговую
+таблицу и отчёт о несовпадающих статусах. Статусы в итоговой таблице
+упорядочены, как в режиме pep без разбиения: по первому документу с таким
+статусом в таблице PEP 0. Если часть остановлена
+ограничением --deadline или --max-pages, причина сохраняется в её файле, а
+итог merge отмечается как частичный.
+"""
+import json
+import logging
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from constants import BASE_DIR, RESULTS_DIR, SHARD_FILE, SHARD_FILE_PATTERN
+from exceptions import IncompleteShardsException
+from outputs import SUCCESS_FILE_CREATED, atomic_output_file, get_results_path
+
+Shard = Tuple[int, int]
+
+SHARDS_NOT_FOUND = 'Файлы частей не найдены в {results_dir}'
+STALE_SPLITS_IGNORED = (
+    'Файлы частей прежних разбиений на {stale} частей не учитываются, '
+    'объединяется последнее разбиение на {count} частей'
+)
+SHARDS_MISSING = 'Не хватает частей {missing} из {count}'
+SHARD_PARTIAL = 'часть {index}/{count}: {reason}'
+
+
+def in_shard(href: str, shard: Shard) -> bool:
+    """Проверяет, относится ли документ PEP к части.
+
+    Параметры:
+        href: Ссылка на документ из таблицы PEP 0.
+        shard: Номер части (начиная с 1) и число частей.
+    """
+    index, count = shard
+    return zlib.crc32(href.encode('utf-8')) % count == index - 1
+
+
+def save_shard(
+    shard: Shard,
+    results: Dict[str, int],
+    mismatches: List[Dict[str, Any]],
+    partial: Optional[str] = None,
+    first_numbers: Optional[Dict[str, int]] = None
+) -> None:
+    """Сохраняет частичные результаты режима pep.
+
+    Параметры:
+        shard: Номер части и число частей.
+        results: Количество документов по статусам.
+        mismatches: Документы с несовпадающими статусами.
+        partial: Причина остановки обхода части ограничением или None.
+        first_numbers: Наименьший номер документа PEP с каждым статусом,
+            по нему команда merge упорядочивает статусы.
+    """
+    index, count = shard
+    file_path = get_results_path(SHARD_FILE.format(index=index, count=count))
+    with atomic_output_file(file_path, None) as shard_file:
+        json.dump(
+            {
+                'shard': [index, count],
+                'results': results,
+                'mismatches': mismatches,
+                'partial': partial,
+                'first_numbers': first_numbers or {},
+            },
+            shard_file,
+            ensure_ascii=False
+        )
+    logging.info(SUCCESS_FILE_CREATED.format(file_path=file_path))
+
+
+def read_shards(results_dir: Path) -> Dict[Shard, Tuple[float, Any]]:
+    """Возвращает время изменения и данные файлов частей по номерам частей.
+
+    Параметры:
+        results_dir: Директория результатов.
+    """
+    shards = {}
+    for file_path in results_dir.glob(SHARD_FILE_PATTERN):
+        with open(file_path, encoding='utf-8') as shard_file:
+            data = json.load(shard_file)
+        shards[tuple(data['shard'])] = file_path.stat().st_mtime, data
+    return shards
+
+
+def newest_split(shards: Dict[Shard, Tuple[float, Any]]) -> int:
+    """Возвращает число частей последнего разбиения.
+    Файлы частей прежних разбиений не учитываются, о них выводится
+    предупреждение.
+
+    Параметры:
+        shards: Время изменения и данные файлов частей.
+    """
+    updated_at = defaultdict(float)
+    for (_, count), (mtime, _) in shards.items():
+        updated_at[count] = max(updated_at[count], mtime)
+    count = max(updated_at, key=updated_at.get)
+    stale = sorted(set(updated_at) - {count})
+    if stale:
+        logging.warning(STALE_SPLITS_IGNORED.format(stale=stale, count=count))
+    return count
+
+
+def order_statuses(
+    results: Dict[str, int],
+    first_numbers: Dict[str, int]
+) -> Dict[str, int]:
+    """Упорядочивает статусы по первому документу с таким статусом в
+    таблице PEP 0, как в режиме pep без разбиения.
+
+    Параметры:
+        results: Количество документов по статусам.
+        first_numbers: Наименьший номер документа PEP с каждым статусом.
+    """
+    return dict(sorted(
+        results.items(),
+        key=lambda item: first_numbers.get(item[0], float('inf'))
+    ))
+
+
+def load_shards() -> Tuple[Dict[str, int], List[Dict[str, Any]], List[str]]:
+    """Объединяет частичные результаты всех частей режима pep.
+    Возвращает количество документов по статусам в порядке таблицы PEP 0,
+    документы с несовпадающими статусами в порядке частей и причины
+    остановки частей, обход которых был прерван ограничением. Если в
+    директории есть файлы нескольких разбиений, объединяется последнее.
+    """
+    results_dir = BASE_DIR / RESULTS_DIR
+    shards = read_shards(results_dir)
+    if not shards:
+        raise IncompleteShardsException(
+            SHARDS_NOT_FOUND.format(results_dir=results_dir)
+        )
+    count = newest_split(shards)
+    missing = [
+        index for index in range(1, count + 1) if (index, count) not in shards
+    ]
+    if missing:
+        raise IncompleteShardsException(
+            SHARDS_MISSING.format(missing=missing, count=count)
+        )
+    results = defaultdict(int)
+    first_numbers: Dict[str, int] = {}
+    mismatches = []
+    partial = []
+    for index in range(1, count + 1):
+        _, data = shards[index, count]
+        for status, amount in data['results'].items():
+            results[status] += amount
+        for status, number in data.get('first_numbers', {}).items():
+            first_numbers[status] = min(
+                number, first_numbers.get(status, number)
+            )
+        mismatches.extend(
+            {**mismatch, 'expected_status': tuple(mismatch['expected_status'])}
+            for mismatch in data['mismatches']
+        )
+        if data.get('partial'):
+            partial.append(SHARD_PARTIAL.format(
+                index=index, count=count, reason=data['partial']
+            ))
+    return order_statuses(results, first_numbers), mismatches, partial
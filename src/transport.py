@@ -0,0 +1,171 @@
+"""Запись и воспроизведение ответов сайтов.
+
+С опцией --record DIR каждый ответ, полученный через сессию, сохраняется
+в снимок: тела ответов подряд пишутся в файл bodies.bin, а адреса,
+смещения, коды и заголовки - в индекс index.json. С опцией --replay DIR
+ответы отдаются из снимка без сетевых запросов и без HTTP-библиотек:
+файл с телами отображается в память, а ответ читается по смещению.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+from argparse import Namespace
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List
+
+from constants import SNAPSHOT_BODIES_FILE, SNAPSHOT_INDEX_FILE
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+RESPONSE_NOT_RECORDED = 'Ответ на запрос {key} отсутствует в снимке {path}'
+RESPONSE_STATUS_ERROR = 'Ответ на запрос {url} с кодом {status_code}'
+
+
+def request_key(method: str, url: str) -> str:
+    """Возвращает ключ ответа в индексе снимка."""
+    return f'{method} {url}'
+
+
+class RecordingSession:
+    """Сессия, сохраняющая полученные ответы в снимок.
+    Остальные атрибуты берутся у исходной сессии.
+    """
+
+    def __init__(self, session: CachedSession, path: Path) -> None:
+        self.session = session
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        self.bodies = open(path / SNAPSHOT_BODIES_FILE, 'wb')
+        self.index: Dict[str, List[Any]] = {}
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    def record(self, method: str, url: str, response: Any) -> Any:
+        """Сохраняет ответ в снимок, если он ещё не сохранён."""
+        key = request_key(method, url)
+        with self.lock:
+            if key not in self.index:
+                offset = self.bodies.tell()
+                self.bodies.write(response.content)
+                self.index[key] = [
+                    offset,
+                    len(response.content),
+                    response.status_code,
+                    dict(response.headers),
+                ]
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self.record('GET', url, self.session.get(url, **kwargs))
+
+    def head(self, url: str, **kwargs: Any) -> Any:
+        return self.record('HEAD', url, self.session.head(url, **kwargs))
+
+    def close(self) -> None:
+        """Дописывает тела ответов и сохраняет индекс снимка."""
+        with self.lock:
+            self.bodies.close()
+            index_path = self.path / SNAPSHOT_INDEX_FILE
+            temp_path = index_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as index_file:
+                json.dump(self.index, index_file)
+            os.replace(temp_path, index_path)
+
+
+class ReplayResponse:
+    """Ответ, прочитанный из снимка."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise ConnectionError(RESPONSE_STATUS_ERROR.format(
+                url=self.url, status_code=self.status_code
+            ))
+
+
+class ReplaySession:
+    """Сессия, отдающая ответы из снимка без обращения к сети."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path / SNAPSHOT_INDEX_FILE, encoding='utf-8') as index_file:
+            self.index = json.load(index_file)
+        with open(path / SNAPSHOT_BODIES_FILE, 'rb') as bodies_file:
+            size = os.fstat(bodies_file.fileno()).st_size
+            self.bodies = mmap.mmap(
+                bodies_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) if size else b''
+        # Настройки, которые режимы serve и --watch задают CachedSession.
+        self.settings = SimpleNamespace(always_revalidate=False)
+
+    def request(self, method: str, url: str) -> ReplayResponse:
+        """Возвращает сохранённый ответ на запрос."""
+        key = request_key(method, url)
+        if key not in self.index:
+            raise ConnectionError(
+                RESPONSE_NOT_RECORDED.format(key=key, path=self.path)
+            )
+        offset, length, status_code, headers = self.index[key]
+        return ReplayResponse(
+            url, status_code, headers, self.bodies[offset:offset + length]
+        )
+
+    def get(self, url: str, **kwargs: Any) -> ReplayResponse:
+        return self.request('GET', url)
+
+    def head(self, url: str, **kwargs: Any) -> ReplayResponse:
+        return self.request('HEAD', url)
+
+    def close(self) -> None:
+        if self.bodies:
+            self.bodies.close()
+
+
+@contextmanager
+def open_session(cli_args: Namespace) -> Iterator[Any]:
+    """Открывает сессию для запросов к сайтам.
+    С опцией --replay ответы читаются из снимка, с опцией --record -
+    сохраняются в снимок при закрытии сессии, в том числе после сбоя.
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+    """
+    if cli_args.replay:
+        session = ReplaySession(Path(cli_args.replay))
+    else:
+        from requests_cache import CachedSession
+
+        session = CachedSession()
+        if cli_args.clear_cache:
+            session.cache.clear()
+        if cli_args.record:
+            session = RecordingSession(session, Path(cli_args.record))
+    try:
+        yield session
+    finally:
+        if cli_args.replay or cli_args.record:
+            session.close()
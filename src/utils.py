@@ -1,16 +1,14 @@
-from typing import Optional
+from __future__ import annotations
 
-from bs4 import BeautifulSoup, Tag
-from requests import RequestException
-from requests_cache import AnyResponse, CachedSession
+import re
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
-from constants import (
-    FIND_NEXT_SIBLING,
-    FIND_TAG_BY_NAME,
-    FIND_TAG_BY_STRING
-)
 from exceptions import ParserFindTagException
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+    from requests_cache import AnyResponse, CachedSession
+
 NOT_FIND_TAG_ERROR = 'Не найден тег {tag} {attrs} {string}'
 REQUEST_ERROR = 'Возникла ошибка при загрузке страницы {url} {error}'
 
@@ -18,7 +16,9 @@ REQUEST_ERROR = 'Возникла ошибка при загрузке стра
 def get_response(
     session: CachedSession,
     url: str,
-    encoding: str = 'utf-8'
+    encoding: str = 'utf-8',
+    method: str = 'GET',
+    **kwargs: Any
 ) -> AnyResponse:
     """Получает ответ с сайта по url.
     Если возникает ошибка при получении ответа, то вызывается исключение.
@@ -27,31 +27,35 @@ def get_response(
         session: Сессия для запросов к сайту.
         url: URL адрес страницы.
         encoding: Кодировка страницы.
+        method: Метод запроса: GET или HEAD.
+        kwargs: Параметры запроса, например force_refresh=True, чтобы
+            не брать ответ из кеша.
     """
     try:
-        response = session.get(url)
-        response.encoding = encoding
-        return response
-    except RequestException as error:
+        response = getattr(session, method.lower())(url, **kwargs)
+    except Exception as error:
+        # requests импортируется только при ошибке: при воспроизведении
+        # снимка (--replay) HTTP-библиотеки не загружаются.
+        from requests import RequestException
+
+        if not isinstance(error, RequestException):
+            raise
         raise ConnectionError(
             REQUEST_ERROR.format(url=url, error=error)
         )
+    response.encoding = encoding
+    return response
 
 
-def get_soup(
-    session: CachedSession,
-    url: str,
-    features='lxml'
-) -> BeautifulSoup:
-    """Получает HTML страницу, парсит её с помощью BeautifulSoup и возвращает
-    разобранный HTML (soup).
+def get_document(session: CachedSession, url: str, parser: Any) -> Any:
+    """Получает HTML страницу и разбирает её выбранным парсером.
 
     Параметры:
         session: Сессия для запросов к сайту.
         url: URL адрес страницы.
-        features: Тип парсера.
+        parser: Парсер из модуля parsers.
     """
-    return BeautifulSoup(get_response(session, url).text, features=features)
+    return parser.parse(get_response(session, url).text)
 
 
 def find_tag_by_name(
@@ -72,14 +76,14 @@ def find_tag_by_name(
 
 def find_tag_by_string(
     soup: BeautifulSoup,
-    string: str,
+    string: Union[str, re.Pattern],
     **kwargs
 ) -> Optional[Tag]:
     """Получает тег по строке внутри тега.
 
     Параметры:
         soup: Проанализированный HTML документ.
-        string: Текст в теге.
+        string: Текст в теге или скомпилированное регулярное выражение.
     """
     text = soup.find(string=string)
     return text.find_parent() if text is not None else None
@@ -97,19 +101,12 @@ def find_next_sibling(
     return soup.find_next_sibling()
 
 
-FIND_TYPE_TO_FUNCTION = {
-    FIND_TAG_BY_NAME: find_tag_by_name,
-    FIND_TAG_BY_STRING: find_tag_by_string,
-    FIND_NEXT_SIBLING: find_next_sibling
-}
-
-
 def find_tag(
     soup: BeautifulSoup,
     tag: Optional[str] = None,
     attrs: Optional[dict] = None,
-    string: Optional[str] = None,
-    find_type: str = FIND_TAG_BY_NAME
+    string: Optional[Union[str, re.Pattern]] = None,
+    find_type: Callable[..., Optional[Tag]] = find_tag_by_name
 ) -> Tag:
     """Получает тег по заданным атрибутам.
     Если не находит тег, то выбрасывает исключение.
@@ -118,10 +115,11 @@ def find_tag(
         soup: Проанализированный HTML документ.
         tag: HTML Тег.
         attrs: Атрибуты тега.
-        string: Текст в теге.
-        find_type: Тип поиска.
+        string: Текст в теге или скомпилированное регулярное выражение.
+        find_type: Функция поиска: find_tag_by_name, find_tag_by_string
+            или find_next_sibling.
     """
-    searched_tag = FIND_TYPE_TO_FUNCTION[find_type](
+    searched_tag = find_type(
         soup,
         tag=tag if tag is not None else '',
         attrs=attrs if attrs is not None else {},
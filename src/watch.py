@@ -0,0 +1,221 @@
+"""Наблюдение за изменениями результатов режима работы.
+
+С опцией --watch режим перезапускается по расписанию, а новые строки
+сравниваются с прошлым снимком результатов по ключу - первому столбцу
+таблицы. Выводятся и логируются только добавленные, удалённые и
+изменившиеся строки; изменения выводятся как результаты режима
+<mode>_changes, чтобы не смешиваться с историей самого режима. Снимок
+обновляется только после успешного вывода изменений и хранится на диске,
+поэтому после перезапуска наблюдение продолжается с прошлого состояния.
+
+Если обход остановлен ограничением --deadline или --max-pages, строка-
+отметка о частичных результатах в сравнение не попадает, а строки, до
+которых обход не дошёл, не считаются удалёнными.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from argparse import Namespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+
+from constants import BASE_DIR, SNAPSHOT_DIR, SNAPSHOT_FILE, TEMP_FILE_SUFFIX
+from outputs import control_output
+from pipeline import PARTIAL_RESULT
+
+if TYPE_CHECKING:
+    from requests_cache import CachedSession
+
+CHANGES_MODE = '{mode}_changes'
+CHANGE_COLUMN = 'Изменение'
+CHANGE_ADDED = 'добавлено'
+CHANGE_REMOVED = 'удалено'
+CHANGE_CHANGED = 'изменено'
+ROW_CHANGED = 'Изменение результатов ({change}): {row}'
+NO_CHANGES = 'Изменений в режиме {mode} нет'
+WATCH_NOT_SUPPORTED = 'Режим {mode} не возвращает таблицу результатов'
+WATCH_ERROR = 'Сбой при обновлении режима {mode}: {error}'
+
+
+def snapshot_path(mode: str) -> os.PathLike:
+    """Возвращает путь к снимку результатов режима."""
+    return BASE_DIR / SNAPSHOT_DIR / SNAPSHOT_FILE.format(mode=mode)
+
+
+def load_snapshot(mode: str, columns: List[str]) -> Dict[str, List[Any]]:
+    """Возвращает строки прошлого снимка режима по ключам.
+    Снимок с другой шапкой таблицы не учитывается.
+
+    Параметры:
+        mode: Режим работы.
+        columns: Шапка таблицы.
+    """
+    try:
+        with open(snapshot_path(mode), encoding='utf-8') as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except FileNotFoundError:
+        return {}
+    if snapshot['columns'] != columns:
+        return {}
+    return {str(row[0]): row for row in snapshot['rows']}
+
+
+def save_snapshot(
+    mode: str,
+    columns: List[str],
+    rows: List[List[Any]]
+) -> None:
+    """Сохраняет снимок результатов режима.
+
+    Параметры:
+        mode: Режим работы.
+        columns: Шапка таблицы.
+        rows: Строки результатов.
+    """
+    file_path = snapshot_path(mode)
+    file_path.parent.mkdir(exist_ok=True)
+    temp_path = file_path.with_name(file_path.name + TEMP_FILE_SUFFIX)
+    with open(temp_path, 'w', encoding='utf-8') as snapshot_file:
+        json.dump(
+            {'columns': columns, 'rows': rows},
+            snapshot_file,
+            ensure_ascii=False
+        )
+    os.replace(temp_path, file_path)
+
+
+def diff_rows(
+    previous: Dict[str, List[Any]],
+    rows: List[List[Any]],
+    partial: bool = False
+) -> Iterator[Tuple[Any, ...]]:
+    """Сравнивает строки с прошлым снимком по ключу - первому столбцу.
+    Отдаёт строки с видом изменения в первом столбце.
+
+    Параметры:
+        previous: Строки прошлого снимка по ключам.
+        rows: Новые строки результатов.
+        partial: Частичные ли результаты: тогда отсутствующие строки не
+            считаются удалёнными.
+    """
+    current = {str(row[0]): row for row in rows}
+    for key, row in current.items():
+        if key not in previous:
+            yield (CHANGE_ADDED, *row)
+        elif previous[key] != row:
+            yield (CHANGE_CHANGED, *row)
+    if partial:
+        return
+    for key, row in previous.items():
+        if key not in current:
+            yield (CHANGE_REMOVED, *row)
+
+
+def output_changes(
+    cli_args: Namespace,
+    columns: List[str],
+    changes: List[Tuple[Any, ...]]
+) -> None:
+    """Логирует изменения и выводит их как результаты режима
+    <mode>_changes.
+
+    Параметры:
+        cli_args: Аргументы командной строки.
+        columns: Шапка таблицы режима.
+        changes: Строки с видом изменения в первом столбце.
+    """
+    if not changes:
+        logging.info(NO_CHANGES.format(mode=cli_args.mode))
+        return
+    for change in changes:
+        logging.info(
+            ROW_CHANGED.format(change=change[0], row=change[1:]),
+            extra={'change': change[0], 'row': change[1:]}
+        )
+    control_output(
+        [(CHANGE_COLUMN, *columns), *changes],
+        Namespace(**{
+            **vars(cli_args),
+            'mode': CHANGES_MODE.format(mode=cli_args.mode)
+        })
+    )
+
+
+def watch_once(
+    session: CachedSession,
+    cli_args: Namespace,
+    function: Callable[..., Optional[Iterable[Tuple[Any, ...]]]]
+) -> bool:
+    """Запускает режим один раз и выводит изменения результатов.
+    Снимок обновляется только после успешного вывода, поэтому при сбое
+    вывода изменения будут выведены при следующем запуске. Возвращает
+    False, если режим не возвращает таблицу результатов.
+
+    Параметры:
+        session: Сессия для запросов к сайту.
+        cli_args: Аргументы командной строки.
+        function: Функция режима работы.
+    """
+    results = function(session, cli_args)
+    if results is None:
+        logging.warning(WATCH_NOT_SUPPORTED.format(mode=cli_args.mode))
+        return False
+    columns, *rows = [list(row) for row in results]
+    complete_rows = [row for row in rows if row[0] != PARTIAL_RESULT]
+    partial = len(complete_rows) != len(rows)
+    previous = load_snapshot(cli_args.mode, columns)
+    output_changes(
+        cli_args,
+        columns,
+        list(diff_rows(previous, complete_rows, partial))
+    )
+    if partial:
+        complete_rows = list({
+            **previous, **{str(row[0]): row for row in complete_rows}
+        }.values())
+    save_snapshot(cli_args.mode, columns, complete_rows)
+    return True
+
+
+def watch(
+    session: CachedSession,
+    cli_args: Namespace,
+    function: Callable[..., Optional[Iterable[Tuple[Any, ...]]]]
+) -> None:
+    """Перезапускает режим каждые --watch секунд и выводит изменения.
+    Страницы при каждом запуске перепроверяются условными запросами.
+    Сбой запуска логируется и не останавливает наблюдение. Работает до
+    прерывания с клавиатуры.
+
+    Параметры:
+        session: Сессия для запросов к сайту или None для команд,
+            которые не обращаются к сети.
+        cli_args: Аргументы командной строки.
+        function: Функция режима работы.
+    """
+    if session is not None:
+        session.settings.always_revalidate = True
+    try:
+        while True:
+            try:
+                if not watch_once(session, cli_args, function):
+                    return
+            except Exception as error:
+                logging.exception(
+                    WATCH_ERROR.format(mode=cli_args.mode, error=error)
+                )
+            time.sleep(cli_args.watch)
+    except KeyboardInterrupt:
+        pass
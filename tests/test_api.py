@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import requests
+import requests_mock
+
+from conftest import SRC_DIR
+try:
+    from src import api
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `api.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `api.py`'
+
+PEP_INDEX = (
+    '<section id="numerical-index"><table class="pep-zero-table"><tbody>'
+    '<tr><td><abbr>PA</abbr></td><td><a href="pep-0001/">1</a></td>'
+    '<td><a href="pep-0001/">PEP Purpose</a></td></tr>'
+    '<tr><td><abbr>IF</abbr></td><td><a href="pep-0020/">20</a></td>'
+    '<td><a href="pep-0020/">The Zen of Python</a></td></tr>'
+    '</tbody></table></section>'
+)
+PEP_PAGE = (
+    '<dl><dt>Status<span>:</span></dt>\n<dd><abbr>{status}</abbr></dd></dl>'
+)
+
+
+def test_api_import_has_no_side_effects():
+    completed = subprocess.run(
+        [
+            sys.executable, '-c',
+            'import logging, sys, api; '
+            'print(len(logging.getLogger().handlers), '
+            '"requests" in sys.modules, "bs4" in sys.modules)'
+        ],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout.split() == ['0', 'False', 'False'], (
+        'Импорт модуля `api.py` не должен настраивать логирование и '
+        'загружать HTTP-библиотеки и парсеры'
+    )
+
+
+def test_iter_pep_statuses_yields_records():
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', api.PEP_URL, text=PEP_INDEX)
+    adapter.register_uri(
+        'GET', api.PEP_URL + 'pep-0001/', text=PEP_PAGE.format(status='Active')
+    )
+    adapter.register_uri(
+        'GET', api.PEP_URL + 'pep-0020/', text=PEP_PAGE.format(status='Draft')
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    got = list(api.iter_pep_statuses(session, workers=2))
+    assert got == [
+        api.PepStatus(
+            1, 'PEP Purpose', 'P', api.PEP_URL + 'pep-0001/', 'A', 'Active'
+        ),
+        api.PepStatus(
+            20, 'The Zen of Python', 'I', api.PEP_URL + 'pep-0020/', 'F',
+            'Draft'
+        ),
+    ], 'Функция `iter_pep_statuses` должна отдавать записи PepStatus'
+    assert [pep.matched for pep in got] == [True, False], (
+        'Запись PepStatus должна сообщать о несовпадении статусов'
+    )
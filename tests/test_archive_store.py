@@ -0,0 +1,74 @@
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+try:
+    from src import archive_store
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `archive_store.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `archive_store.py`'
+    )
+
+ARCHIVE_URL = 'https://docs.python.org/3/archives/python-docs-pdf-a4.zip'
+
+
+class ArchiveSession:
+
+    def __init__(self):
+        self.content = b'archive v1'
+        self.etag = '"v1"'
+        self.downloads = 0
+
+    def head(self, url, **kwargs):
+        return SimpleNamespace(headers={
+            'ETag': self.etag, 'Content-Length': str(len(self.content))
+        })
+
+    def get(self, url, **kwargs):
+        self.downloads += 1
+        return SimpleNamespace(content=self.content, headers={})
+
+
+def test_update_archive_skips_unchanged_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_store, 'BASE_DIR', tmp_path)
+    session = ArchiveSession()
+    archive_store.update_archive(session, ARCHIVE_URL)
+    latest_path = archive_store.update_archive(session, ARCHIVE_URL)
+    assert session.downloads == 1, (
+        'Неизменившийся архив не должен загружаться повторно'
+    )
+    session.content, session.etag = b'archive v2', '"v2"'
+    archive_store.update_archive(session, ARCHIVE_URL)
+    versions = archive_store.load_manifest(latest_path.parent)[
+        latest_path.name
+    ]
+    assert session.downloads == 2 and len(versions) == 2, (
+        'Изменившийся архив должен загружаться и добавляться в манифест'
+    )
+    assert latest_path.read_bytes() == b'archive v2', (
+        'Ссылка на архив должна указывать на последнюю версию'
+    )
+
+
+def test_extract_archive_verifies_crc(tmp_path):
+    archive_path = tmp_path / 'docs.zip'
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr('docs/a.pdf', b'a' * 1000)
+        archive.writestr('docs/b.pdf', b'b' * 1000)
+    destination = archive_store.extract_archive(archive_path, workers=2)
+    assert (destination / 'docs' / 'b.pdf').read_bytes() == b'b' * 1000, (
+        'Опция --extract должна распаковывать все файлы архива'
+    )
+    data = bytearray(archive_path.read_bytes())
+    data[data.find(b'aaaa')] ^= 1
+    archive_path.write_bytes(bytes(data))
+    with pytest.raises(zipfile.BadZipFile):
+        archive_store.extract_archive(archive_path, workers=2)
+    assert (destination / 'docs' / 'a.pdf').read_bytes() == b'a' * 1000, (
+        'Архив с неверной контрольной суммой не должен заменять '
+        'распакованные ранее файлы'
+    )
@@ -0,0 +1,73 @@
+from argparse import Namespace
+try:
+    from src import checkpoint
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoint.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoint.py`'
+
+
+def test_journal_resumes_after_partial_record(tmp_path):
+    file_path = tmp_path / 'checkpoints' / 'pep.jsonl'
+    journal = checkpoint.Journal(file_path, resume=False)
+    journal.record('https://peps.python.org/pep-0001/', 'Active')
+    journal.record('https://peps.python.org/pep-0002/', 'Final')
+    journal.close()
+    with open(file_path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"url": "https://peps.python.org/pep-0003/", ')
+    resumed = checkpoint.Journal(file_path, resume=True)
+    resumed.close()
+    assert resumed.done == {
+        'https://peps.python.org/pep-0001/': 'Active',
+        'https://peps.python.org/pep-0002/': 'Final',
+    }, (
+        'Журнал контрольных точек должен восстанавливать обработанные '
+        'страницы и пропускать недописанную запись'
+    )
+
+
+def test_checkpoint_journal_kept_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode='pep', resume=False)
+    try:
+        with checkpoint.checkpoint_journal(cli_args) as journal:
+            journal.record('https://peps.python.org/pep-0001/', 'Active')
+            raise ConnectionError
+    except ConnectionError:
+        pass
+    file_path = journal.file_path
+    assert file_path.exists(), (
+        'Журнал контрольных точек должен сохраняться при сбое обхода'
+    )
+    with checkpoint.checkpoint_journal(
+        Namespace(mode='pep', resume=True)
+    ) as journal:
+        assert journal.done == {'https://peps.python.org/pep-0001/': 'Active'}
+    assert not file_path.exists(), (
+        'Журнал контрольных точек должен удаляться после успешного обхода'
+    )
+
+
+def test_shard_journals_are_independent(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, 'BASE_DIR', tmp_path)
+    first = Namespace(mode='pep', resume=False, shard=(1, 2))
+    with checkpoint.checkpoint_journal(first) as journal:
+        journal.record('https://peps.python.org/pep-0001/', 'Active')
+        journal.keep = True
+    with checkpoint.checkpoint_journal(
+        Namespace(mode='pep', resume=False, shard=(2, 2))
+    ) as journal:
+        journal.record('https://peps.python.org/pep-0002/', 'Final')
+    with checkpoint.checkpoint_journal(
+        Namespace(mode='pep', resume=False, shard=None, watch=60)
+    ):
+        pass
+    with checkpoint.checkpoint_journal(
+        Namespace(mode='pep', resume=True, shard=(1, 2))
+    ) as journal:
+        assert journal.done == {
+            'https://peps.python.org/pep-0001/': 'Active'
+        }, (
+            'Запуски других частей --shard и наблюдения --watch не должны '
+            'затирать журнал контрольных точек части'
+        )
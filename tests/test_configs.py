@@ -29,7 +29,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'sqlite', 'table'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +64,47 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+def test_configure_logging_uses_queue(monkeypatch, tmp_path):
+    import atexit
+    import logging
+    from logging.handlers import QueueHandler
+    monkeypatch.setattr(configs, 'LOG_DIR', tmp_path)
+    monkeypatch.setattr(configs, 'LOG_FILE', tmp_path / 'parser.log')
+    root_logger = logging.getLogger()
+    monkeypatch.setattr(root_logger, 'handlers', [])
+    listener = configs.configure_logging()
+    try:
+        assert [type(handler) for handler in root_logger.handlers] == [
+            QueueHandler
+        ], (
+            'Функция `configure_logging` должна подключать к корневому '
+            'логгеру только `QueueHandler`'
+        )
+        logging.warning('Проверка логирования')
+    finally:
+        atexit.unregister(listener.stop)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    assert 'Проверка логирования' in (tmp_path / 'parser.log').read_text(
+        encoding='utf-8'
+    ), 'Записи из очереди должны попадать в файл логов'
+
+
+@pytest.mark.parametrize('value', ['0', '-2', 'many'])
+def test_workers_must_be_positive(value):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--workers', value])
+
+
+@pytest.mark.parametrize(
+    'option', ['--refresh', '--watch', '--deadline', '--max-pages']
+)
+@pytest.mark.parametrize('value', ['0', '-1', 'nan', 'soon'])
+def test_limits_must_be_positive(option, value):
+    parser = configs.configure_argument_parser(['serve'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['serve', option, value])
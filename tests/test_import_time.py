@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SRC_DIR
+
+HEAVY_MODULES = ('bs4', 'lxml', 'prettytable', 'requests_cache', 'tqdm')
+IMPORT_TIME_BUDGET_US = 100_000
+STARTUP_CODE = (
+    'import configs, main; '
+    'configs.configure_argument_parser(main.MODE_TO_FUNCTION.keys())'
+)
+
+
+def import_times(code: str) -> dict:
+    """Запускает код с `-X importtime` и возвращает время импорта модулей.
+
+    Ключ словаря - имя модуля, значение - суммарное время импорта в мкс.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope='module')
+def startup_import_times():
+    return import_times(STARTUP_CODE)
+
+
+@pytest.mark.parametrize('module', HEAVY_MODULES)
+def test_heavy_modules_not_imported(startup_import_times, module):
+    assert module not in startup_import_times, (
+        f'Модуль `{module}` не должен импортироваться при запуске парсера. '
+        'Импортируйте его внутри функции, которая его использует.'
+    )
+
+
+def test_main_import_time(startup_import_times):
+    assert startup_import_times['main'] < IMPORT_TIME_BUDGET_US, (
+        'Импорт модуля `main.py` занимает '
+        f'{startup_import_times["main"]} мкс, '
+        f'бюджет - {IMPORT_TIME_BUDGET_US} мкс.'
+    )
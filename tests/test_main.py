@@ -1,5 +1,6 @@
 import pytest
 from pathlib import Path
+from typing import Iterator
 try:
     from src import main
 except ModuleNotFoundError:
@@ -33,9 +34,10 @@ def test_main_file():
 def test_whats_new(mock_session):
     got = main.whats_new(mock_session)
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
-    assert isinstance(got, list), (
-        'Функция `whats_new` должна возвращать объект типа `list`'
+    assert isinstance(got, Iterator), (
+        'Функция `whats_new` должна возвращать итератор строк результата'
     )
+    got = list(got)
     assert len(got) > 0, (
         'Убедитесь что функция `whats_new` модуля `main.py` '
         'возвращает непустой список'
@@ -54,9 +56,10 @@ def test_whats_new(mock_session):
 @pytest.mark.skip()
 def test_latest_versions(mock_session):
     got = main.latest_versions(mock_session)
-    assert isinstance(got, list), (
-        'Функция `latest_versions` должна возвращать объект типа `list`'
+    assert isinstance(got, Iterator), (
+        'Функция `latest_versions` должна возвращать итератор строк результата'
     )
+    got = list(got)
     assert isinstance(got[0], tuple), (
         'Функция `latest_versions` должна вернуть список `result`, '
         'элементами которого должны быть объекты типа `tuple`'
@@ -88,7 +91,7 @@ def test_latest_versions(mock_session):
 
 def test_download(monkeypatch, tmp_path, mock_session):
     mock_base_dir = Path(tmp_path)
-    monkeypatch.setattr(main, 'BASE_DIR', mock_base_dir)
+    monkeypatch.setattr('archive_store.BASE_DIR', mock_base_dir)
     got = main.download(mock_session)
     dirs = [
         directory for directory in mock_base_dir.iterdir()
@@ -99,12 +102,20 @@ def test_download(monkeypatch, tmp_path, mock_session):
         'Убедитесь что для хранения архивов с документацией Python в '
         'директории `src` создаётся директория `downloads` '
     )
-    output_files = [
-        f for f in mock_base_dir.glob('**/*') if str(f).endswith('.zip')
+    objects = list((mock_base_dir / 'downloads' / 'objects').glob('*.zip'))
+    assert len(objects) == 1 and len(objects[0].stem) == 64, (
+        'Убедитесь что архив с документацией Python сохраняется в '
+        '`src/downloads/objects` под именем, равным хешу SHA-256 содержимого'
+    )
+    latest = [
+        f for f in (mock_base_dir / 'downloads').iterdir()
+        if f.name.endswith('.zip')
     ]
-    assert len(output_files) != 0, (
-        'Убедитесь что архив с документацией Python загружается'
-        'в директорию `src/downloads`  '
+    assert len(latest) == 1 and latest[0].read_bytes() == (
+        objects[0].read_bytes()
+    ), (
+        'Убедитесь что `src/downloads/<имя архива>` указывает на последнюю '
+        'версию архива'
     )
     assert got is None, (
         'Функция `download` в модуле `main.py` не должна возвращать значение.',
@@ -140,3 +151,24 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('command', ['merge', 'query'])
+def test_offline_commands_skip_session(monkeypatch, command):
+    sessions = []
+
+    def open_session(cli_args):
+        raise AssertionError('open_session')
+
+    monkeypatch.setattr(main, 'configure_logging', lambda: None)
+    monkeypatch.setattr(main, 'open_session', open_session)
+    monkeypatch.setitem(
+        main.COMMAND_TO_FUNCTION, command,
+        lambda session, cli_args: sessions.append(session)
+    )
+    monkeypatch.setattr('sys.argv', ['main.py', command])
+    main.main()
+    assert sessions == [None], (
+        f'Команда `{command}` не обращается к сети и не должна '
+        'открывать сессию для запросов.'
+    )
@@ -0,0 +1,39 @@
+import threading
+import time
+try:
+    from src import memo
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memo.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memo.py`'
+
+
+def test_extraction_cache_evicts_least_recently_used():
+    cache = memo.ExtractionCache(max_size=2)
+    first = cache.key('lxml', 'pep_status', '<p>1</p>')
+    second = cache.key('lxml', 'pep_status', '<p>2</p>')
+    third = cache.key('lxml', 'pep_status', '<p>3</p>')
+    cache.put(first, 'Active')
+    cache.put(second, 'Final')
+    cache.get(first)
+    cache.put(third, 'Draft')
+    assert cache.get(second) is memo.MISSING, (
+        'Кеш извлечения должен вытеснять давно не использованные записи'
+    )
+    assert cache.get(first) == 'Active' and cache.get(third) == 'Draft', (
+        'Кеш извлечения должен хранить недавно использованные записи'
+    )
+
+
+def test_extraction_cache_persists(tmp_path):
+    file_path = tmp_path / 'cache' / 'extracted.pickle'
+    cache = memo.ExtractionCache(max_size=10)
+    cache.load(file_path)
+    key = cache.key('lxml', 'pep_status', '<p>1</p>')
+    cache.put(key, 'Active')
+    cache.save()
+    loaded = memo.ExtractionCache(max_size=10)
+    loaded.load(file_path)
+    assert loaded.get(key) == 'Active', (
+        'Кеш извлечения должен загружать записи, сохранённые на диск'
+    )
@@ -1,3 +1,6 @@
+import gzip
+import json
+import sqlite3
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -11,8 +14,14 @@ except ImportError:
     assert False, 'Убедитесь что в директории `src` есть файл `outputs.py`'
 
 
-def cli_args(mode: str, output_format: Optional[str]) -> Namespace:
-    return Namespace(mode=mode, output=output_format)
+def cli_args(
+    mode: str,
+    output_format: Optional[str],
+    compress: Optional[str] = None
+) -> Namespace:
+    return Namespace(
+        mode=mode, output=output_format, compress=compress, pager=False
+    )
 
 
 @pytest.mark.parametrize('cli_arg', [
@@ -46,6 +55,24 @@ def test_control_output_pretty(capsys, records, cli_arg, part_output):
     )
 
 
+def test_control_output_table(capsys, monkeypatch, records):
+    monkeypatch.setattr(outputs, 'TABLE_SAMPLE_SIZE', 1)
+    monkeypatch.setattr(outputs, 'TABLE_MAX_CELL_WIDTH', 20)
+    records = records('whats-new')
+    outputs.control_output(records, cli_args('whats-new', 'table'))
+    captured_out, _ = capsys.readouterr()
+    lines = captured_out.splitlines()
+    assert len(lines) == len(records) + 3, (
+        'Таблица должна состоять из шапки, строк результатов и трёх границ'
+    )
+    assert len(set(map(len, lines))) == 1, (
+        'Все строки таблицы должны иметь одинаковую ширину'
+    )
+    assert '------' in lines[0] and '…' in captured_out, (
+        'Длинные значения ячеек должны обрезаться до ширины столбца'
+    )
+
+
 @pytest.mark.parametrize('cli_arg', [
     cli_args('whats-new', 'file'),
     cli_args('latest-versions', 'file'),
@@ -80,6 +107,78 @@ def test_control_output_file(monkeypatch, tmp_path, records, cli_arg):
     )
 
 
+@pytest.mark.parametrize('cli_arg', [
+    cli_args('whats-new', 'jsonl'),
+    cli_args('latest-versions', 'jsonl'),
+    cli_args('pep', 'jsonl'),
+])
+def test_control_output_json(monkeypatch, tmp_path, records, cli_arg):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    records = records(cli_arg.mode)
+    outputs.control_output(records, cli_arg)
+    output_files = list(Path(tmp_path).glob('results/*.jsonl'))
+    assert len(output_files) == 1, (
+        'Убедитесь что результаты сохраняются в файл `.jsonl` '
+        'в директории `results`'
+    )
+    with open(output_files[0], encoding='utf-8') as json_file:
+        got = [json.loads(line) for line in json_file]
+    assert got == [dict(zip(records[0], row)) for row in records[1:]], (
+        'Каждая строка файла JSON Lines должна быть объектом, ключи которого '
+        '- названия столбцов таблицы'
+    )
+
+
+@pytest.mark.parametrize('output_format, suffix', [
+    ('file', '.csv.gz'),
+    ('jsonl', '.jsonl.gz'),
+])
+def test_control_output_gzip(
+    monkeypatch, tmp_path, records, output_format, suffix
+):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    records = records('pep')
+    outputs.control_output(records, cli_args('pep', output_format, 'gzip'))
+    output_files = list(Path(tmp_path).glob('results/*'))
+    assert [file.name.endswith(suffix) for file in output_files] == [True], (
+        'Убедитесь что в директории `results` остаётся только итоговый '
+        f'сжатый файл `{suffix}`'
+    )
+    with gzip.open(output_files[0], 'rt', encoding='utf-8') as output_file:
+        assert records[1][0] in output_file.read(), (
+            'Сжатый файл должен содержать результаты парсинга'
+        )
+
+
+def test_control_output_file_not_published_on_error(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+
+    def broken_results():
+        yield 'Статус', 'Количество'
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        outputs.control_output(broken_results(), cli_args('pep', 'file'))
+    assert not list(Path(tmp_path).glob('results/*.csv')), (
+        'Файл с результатами не должен появляться, если запись прервана'
+    )
+
+
+def test_control_output_sqlite(monkeypatch, tmp_path, records):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    monkeypatch.setattr(outputs, 'OUTPUT_BATCH_SIZE', 2)
+    records = records('whats-new')
+    for _ in range(2):
+        outputs.control_output(records, cli_args('whats-new', 'sqlite'))
+    connection = sqlite3.connect(tmp_path / 'results' / 'results.sqlite3')
+    got = connection.execute('SELECT * FROM "whats-new"').fetchall()
+    connection.close()
+    assert [row[1:] for row in got] == records[1:] * 2, (
+        'Убедитесь что каждый запуск добавляет строки результатов в '
+        'таблицу режима работы парсера'
+    )
+
+
 def test_output_file():
     assert hasattr(outputs, 'control_output'), (
         'Напишите функцию `control_output` в модуле `output.py`'
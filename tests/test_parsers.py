@@ -0,0 +1,79 @@
+import pytest
+try:
+    from src import parsers
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parsers.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parsers.py`'
+
+PAGES = {
+    'whats_new_links': (
+        '<section id="what-s-new-in-python"><div class="toctree-wrapper">'
+        '<ul><li class="toctree-l1"><a href="3.13.html">3.13</a></li>'
+        '<li class="toctree-l1"><a href="changelog.html">Changelog</a></li>'
+        '</ul></div></section>'
+    ),
+    'whats_new_article': (
+        '<h1>What’s New In Python 3.13<a class="headerlink">¶</a></h1>'
+        '<dl><dt>Editor<span>:</span></dt>\n<dd><p>Thomas &amp; Adam</p>'
+        '</dd></dl>'
+    ),
+    'python_versions': (
+        '<div class="sphinxsidebarwrapper"><ul><li>Other</li></ul><ul>'
+        '<li><a href="https://docs.python.org/3.13/">Python 3.13 (stable)'
+        '</a></li><li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li></ul></div>'
+    ),
+    'pdf_a4_link': (
+        '<div role="main"><table class="docutils"><tr><td>'
+        '<a href="archives/docs-pdf-letter.zip">Letter</a>'
+        '<a href="archives/docs-pdf-a4.zip">A4</a></td></tr></table></div>'
+    ),
+    'pep_rows': (
+        '<section id="numerical-index"><table class="pep-zero-table">'
+        '<tbody><tr><td><abbr>PA</abbr></td><td>'
+        '<a href="pep-0001/">1</a></td><td><a href="pep-0001/">'
+        'PEP Purpose and Guidelines</a></td></tr></tbody></table></section>'
+    ),
+    'pep_status': (
+        '<dl><dt>Author<span>:</span></dt><dd>Guido</dd>'
+        '<dt>Status<span>:</span></dt>\n<dd><abbr>Final</abbr></dd></dl>'
+    ),
+}
+EXPECTED = {
+    'whats_new_links': ['3.13.html'],
+    'whats_new_article': ('What’s New In Python 3.13¶', 'Editor: Thomas & Adam'),
+    'python_versions': [
+        ('https://docs.python.org/3.13/', 'Python 3.13 (stable)'),
+        ('https://www.python.org/doc/versions/', 'All versions'),
+    ],
+    'pdf_a4_link': 'archives/docs-pdf-a4.zip',
+    'pep_rows': [
+        ('PA', 'pep-0001/', '1', 'PEP Purpose and Guidelines')
+    ],
+    'pep_status': 'Final',
+}
+
+
+@pytest.mark.parametrize(
+    'parser', parsers.available_parsers(), ids=lambda parser: parser.name
+)
+@pytest.mark.parametrize('method', PAGES)
+def test_parsers_extract_same_data(parser, method):
+    got = getattr(parser, method)(parser.parse(PAGES[method]))
+    assert got == EXPECTED[method], (
+        f'Парсер `{parser.name}` должен извлекать те же данные методом '
+        f'`{method}`, что и остальные парсеры'
+    )
+
+
+@pytest.mark.parametrize(
+    'parser', parsers.available_parsers(), ids=lambda parser: parser.name
+)
+def test_parsers_raise_when_tag_not_found(parser):
+    with pytest.raises(BaseException) as excinfo:
+        parser.pdf_a4_link(parser.parse('<p>Пусто</p>'))
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Если тег не найден, парсер должен выбрасывать '
+        '`ParserFindTagException`'
+    )
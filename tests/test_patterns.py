@@ -0,0 +1,45 @@
+from bs4 import BeautifulSoup
+try:
+    from src import patterns
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `patterns.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `patterns.py`'
+
+WHATS_NEW_PAGE = (
+    '<section id="what-s-new-in-python"><div class="toctree-wrapper"><ul>'
+    '<li class="toctree-l1"><a href="3.13.html">3.13</a><ul>'
+    '<li class="toctree-l2"><a href="3.13.html#summary">Summary</a></li>'
+    '</ul></li><li class="toctree-l1"><a href="3.12.html">3.12</a></li>'
+    '<li class="toctree-l1"><a href="changelog.html">Changelog</a></li>'
+    '</ul></div></section>'
+)
+PEP_ZERO_PAGE = (
+    '<section id="numerical-index"><table class="pep-zero-table">'
+    '<thead><tr><th>PEP</th></tr></thead><tbody>'
+    '<tr><td><abbr>PA</abbr></td></tr><tr><td><abbr>SF</abbr></td></tr>'
+    '</tbody></table></section>'
+)
+
+
+def test_whats_new_links():
+    soup = BeautifulSoup(WHATS_NEW_PAGE, features='lxml')
+    got = [a_tag['href'] for a_tag in patterns.WHATS_NEW_LINKS.select(soup)]
+    assert got == ['3.13.html', '3.12.html'], (
+        'Селектор `WHATS_NEW_LINKS` должен находить ссылки на статьи '
+        'без вложенных ссылок и ссылки на changelog'
+    )
+
+
+def test_pep_rows():
+    soup = BeautifulSoup(PEP_ZERO_PAGE, features='lxml')
+    assert len(patterns.PEP_ROWS.select(soup)) == 2, (
+        'Селектор `PEP_ROWS` должен находить строки таблицы PEP 0 без шапки'
+    )
+
+
+def test_version_status():
+    got = patterns.VERSION_STATUS.search('Python 3.13 (in development)')
+    assert got.groups() == ('3.13', 'in development'), (
+        'Выражение `VERSION_STATUS` должно выделять версию и статус'
+    )
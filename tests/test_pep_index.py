@@ -0,0 +1,47 @@
+from argparse import Namespace
+try:
+    from src import pep_index
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_index.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_index.py`'
+
+RECORDS = [
+    (1, 'PEP Purpose', 'P', 'A', 'Active', False, 'pep-0001/'),
+    (8, 'Style Guide', 'P', 'A', 'Active', False, 'pep-0008/'),
+    (20, 'The Zen', 'I', 'A', 'Final', True, 'pep-0020/'),
+]
+
+
+def query_args(**filters):
+    return Namespace(**{
+        'status': None, 'type': None, 'mismatch': False, 'numbers': None,
+        **filters
+    })
+
+
+def test_query_filters_pep_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(pep_index, 'BASE_DIR', tmp_path)
+    pep_index.save_pep_index(RECORDS)
+    pep_index.save_pep_index(RECORDS[:1])
+    header, *rows = pep_index.query(None, query_args())
+    assert header == pep_index.PEP_INDEX_COLUMN_HEADERS and len(rows) == 3, (
+        'Индекс PEP должен хранить по одной строке на документ'
+    )
+    numbers = {
+        'status': [1, 8],
+        'mismatch': [20],
+        'range': [8, 20],
+        'type': [20],
+    }
+    filters = {
+        'status': query_args(status='active'),
+        'mismatch': query_args(mismatch=True),
+        'range': query_args(numbers=(2, 20)),
+        'type': query_args(type='i'),
+    }
+    for name, cli_args in filters.items():
+        _, *rows = pep_index.query(None, cli_args)
+        assert [row[0] for row in rows] == numbers[name], (
+            f'Команда query должна фильтровать документы PEP ({name})'
+        )
@@ -0,0 +1,144 @@
+import time
+
+import pytest
+try:
+    from src import pipeline
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pipeline.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pipeline.py`'
+
+
+def slow_double(number):
+    time.sleep(0.001 * (number % 3))
+    return number * 2
+
+
+def test_run_pipeline_keeps_source_order():
+    got = pipeline.run_pipeline(range(50), (
+        pipeline.Stage(slow_double, workers=4),
+        pipeline.Stage(lambda number: number + 1, workers=2),
+    ), queue_size=2)
+    assert list(got) == [number * 2 + 1 for number in range(50)], (
+        'Конвейер должен отдавать результаты в порядке заданий источника'
+    )
+
+
+def test_run_pipeline_drops_tasks():
+    got = pipeline.run_pipeline(range(10), (
+        pipeline.Stage(
+            lambda number: pipeline.DROP if number % 2 else number,
+            workers=3
+        ),
+        pipeline.Stage(str),
+    ))
+    assert list(got) == ['0', '2', '4', '6', '8'], (
+        'Задания, для которых стадия вернула `DROP`, '
+        'не должны попадать в результаты'
+    )
+
+
+def test_run_pipeline_raises_stage_error():
+    def broken(number):
+        if number == 5:
+            raise ValueError(number)
+        return number
+
+    with pytest.raises(ValueError):
+        list(pipeline.run_pipeline(
+            range(100), (pipeline.Stage(broken, workers=2),)
+        ))
+
+
+def test_budget_limits_new_pages():
+    budget = pipeline.Budget(max_pages=3)
+    tasks = [(f'pep-{number}/', None) for number in range(10)]
+    done = {'pep-1/': 'Final'}
+    got = [url for url, _ in budget.limit(tasks, done)]
+    assert got == ['pep-0/', 'pep-1/', 'pep-2/', 'pep-3/'] and (
+        budget.exhausted
+    ), (
+        'Ограничение --max-pages должно останавливать загрузку новых '
+        'страниц, не учитывая страницы из журнала контрольных точек'
+    )
+    deadline = pipeline.Budget(deadline=0)
+    assert not list(deadline.limit(tasks, {})) and deadline.exhausted, (
+        'Ограничение --deadline должно останавливать загрузку страниц '
+        'после истечения срока'
+    )
+
+
+def test_run_pipeline_rejects_stage_without_workers():
+    with pytest.raises(ValueError):
+        list(pipeline.run_pipeline(range(10), (pipeline.Stage(str, 0),)))
+
+
+class SlowSession:
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.fetched = []
+
+    def get(self, url, **kwargs):
+        self.fetched.append(url)
+        time.sleep(self.delay)
+        return type('Response', (), {'text': url})()
+
+
+class EchoParser:
+    name = 'echo'
+
+    def parse(self, html):
+        return html
+
+    def pep_status(self, document):
+        return document
+
+
+def test_budget_deadline_stops_queued_fetches():
+    session = SlowSession(delay=0.2)
+    budget = pipeline.Budget(deadline=0.5)
+    tasks = [(f'pep-{number}/', None) for number in range(40)]
+    started = time.monotonic()
+    got = list(pipeline.crawl_pages(
+        session,
+        EchoParser(),
+        budget.limit(tasks, {}),
+        'pep_status',
+        lambda url, _, status: status,
+        4,
+        pipeline.ExtractionCache(100),
+        budget=budget
+    ))
+    elapsed = time.monotonic() - started
+    assert budget.exhausted and elapsed < 1.0, (
+        'После истечения срока --deadline конвейер должен дожидаться только '
+        'уже начатых загрузок, а не заданий из очередей'
+    )
+    assert len(session.fetched) <= 12 and got == session.fetched[:len(got)], (
+        'Задания, взятые из очереди после истечения срока, не должны '
+        'загружаться'
+    )
+
+
+def test_run_pipeline_bounds_results_behind_slow_task():
+    started = []
+    started_before_first = []
+
+    def slow_first(number):
+        started.append(number)
+        if number == 0:
+            time.sleep(0.3)
+            started_before_first.append(len(started))
+        return number
+
+    got = pipeline.run_pipeline(
+        range(500), (pipeline.Stage(slow_first, workers=4),), queue_size=2
+    )
+    assert list(got) == list(range(500)), (
+        'Конвейер должен отдавать все результаты в порядке заданий'
+    )
+    assert started_before_first[0] <= 2 + 4, (
+        'Пока первое задание не обработано, конвейер не должен брать из '
+        'источника больше заданий, чем размер очереди и число потоков'
+    )
@@ -0,0 +1,46 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+try:
+    from src import server
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+
+@pytest.fixture
+def results_server():
+    store = server.ResultsStore(('pep', 'latest-versions'))
+    http_server = server.create_server('127.0.0.1', 0, store)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield store, f'http://127.0.0.1:{http_server.server_address[1]}'
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def test_server_returns_mode_results(results_server):
+    store, url = results_server
+    store.update('pep', [('Статус', 'Количество'), ('Active', 1)])
+    with urlopen(f'{url}/pep') as response:
+        data = json.load(response)
+    assert data['columns'] == ['Статус', 'Количество'] and (
+        data['rows'] == [['Active', 1]]
+    ), 'Сервер должен отдавать результаты режима в формате JSON'
+
+
+def test_server_reports_unready_and_unknown_modes(results_server):
+    _, url = results_server
+    statuses = []
+    for path in ('/latest-versions', '/unknown'):
+        with pytest.raises(HTTPError) as excinfo:
+            urlopen(url + path)
+        statuses.append(excinfo.value.code)
+    assert statuses == [503, 404], (
+        'Сервер должен отвечать 503 для ещё не собранных результатов и '
+        '404 для неизвестных режимов'
+    )
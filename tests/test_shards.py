@@ -0,0 +1,80 @@
+import os
+
+import pytest
+try:
+    from src import shards
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+
+HREFS = [f'pep-{number:04d}/' for number in range(1, 101)]
+
+
+def test_in_shard_partitions_rows():
+    parts = [
+        [href for href in HREFS if shards.in_shard(href, (index, 3))]
+        for index in (1, 2, 3)
+    ]
+    assert sorted(sum(parts, [])) == HREFS, (
+        'Каждый документ PEP должен попадать ровно в одну часть'
+    )
+
+
+def test_load_shards_merges_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(shards, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(
+        shards, 'get_results_path', lambda file_name: tmp_path / file_name
+    )
+    monkeypatch.setattr(shards, 'RESULTS_DIR', '.')
+    mismatch = dict(
+        pep_link='https://peps.python.org/pep-0003/',
+        current_status='Final',
+        expected_status=('Draft', 'Active')
+    )
+    shards.save_shard((1, 2), {'Active': 2, 'Final': 1}, [mismatch])
+    with pytest.raises(BaseException) as excinfo:
+        shards.load_shards()
+    assert excinfo.typename == 'IncompleteShardsException', (
+        'Команда merge должна сообщать о недостающих частях исключением '
+        '`IncompleteShardsException`'
+    )
+    shards.save_shard((2, 2), {'Final': 3}, [])
+    assert shards.load_shards() == (
+        {'Active': 2, 'Final': 4}, [mismatch], []
+    ), 'Команда merge должна суммировать результаты всех частей'
+    shards.save_shard((2, 2), {'Final': 1}, [], 'достигнут лимит страниц 1')
+    assert shards.load_shards()[2] == [
+        'часть 2/2: достигнут лимит страниц 1'
+    ], (
+        'Команда merge должна сообщать, какие части были остановлены '
+        'ограничением обхода'
+    )
+
+
+def test_load_shards_orders_statuses_and_ignores_old_split(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(shards, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(
+        shards, 'get_results_path', lambda file_name: tmp_path / file_name
+    )
+    monkeypatch.setattr(shards, 'RESULTS_DIR', '.')
+    shards.save_shard((1, 3), {'Draft': 1}, [])
+    old_file = next(tmp_path.glob('pep-shard-1-of-3.json'))
+    os.utime(old_file, (0, 0))
+    shards.save_shard(
+        (1, 2), {'Active': 1, 'Final': 2}, [], None,
+        {'Active': 20, 'Final': 1}
+    )
+    shards.save_shard(
+        (2, 2), {'Rejected': 1, 'Final': 1}, [], None,
+        {'Rejected': 3, 'Final': 2}
+    )
+    results, _, _ = shards.load_shards()
+    assert list(results.items()) == [
+        ('Final', 3), ('Rejected', 1), ('Active', 1)
+    ], (
+        'Команда merge должна объединять последнее разбиение и выводить '
+        'статусы в порядке таблицы PEP 0'
+    )
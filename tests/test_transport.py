@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+try:
+    from src import transport
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+
+URL = 'https://peps.python.org/'
+
+
+class FakeSession:
+
+    def get(self, url):
+        return SimpleNamespace(
+            content='<h1>PEP 0</h1>'.encode(),
+            status_code=200,
+            headers={'Content-Type': 'text/html'}
+        )
+
+    def head(self, url):
+        return SimpleNamespace(
+            content=b'', status_code=200, headers={'ETag': '"abc"'}
+        )
+
+
+def test_replay_returns_recorded_responses(tmp_path):
+    recorder = transport.RecordingSession(FakeSession(), tmp_path)
+    recorder.get(URL)
+    recorder.head(URL)
+    recorder.close()
+    replay = transport.ReplaySession(tmp_path)
+    response = replay.get(URL)
+    assert (response.text, response.status_code) == ('<h1>PEP 0</h1>', 200), (
+        'Сессия --replay должна отдавать тело и код записанного ответа'
+    )
+    assert replay.head(URL).headers == {'ETag': '"abc"'}, (
+        'Сессия --replay должна отдавать заголовки ответа на запрос HEAD'
+    )
+    with pytest.raises(ConnectionError):
+        replay.get(URL + 'pep-0001/')
+    replay.close()
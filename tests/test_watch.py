@@ -0,0 +1,97 @@
+from argparse import Namespace
+try:
+    from src import watch
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watch.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watch.py`'
+
+
+def test_diff_rows_compares_by_key():
+    previous = {
+        'Active': ['Active', 4],
+        'Draft': ['Draft', 3],
+        'Final': ['Final', 5],
+    }
+    rows = [['Active', 4], ['Draft', 2], ['Rejected', 1]]
+    assert list(watch.diff_rows(previous, rows)) == [
+        (watch.CHANGE_CHANGED, 'Draft', 2),
+        (watch.CHANGE_ADDED, 'Rejected', 1),
+        (watch.CHANGE_REMOVED, 'Final', 5),
+    ], (
+        'Режим наблюдения должен выводить только добавленные, удалённые и '
+        'изменившиеся строки'
+    )
+
+
+def test_watch_once_outputs_only_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, 'BASE_DIR', tmp_path)
+    outputs = []
+    monkeypatch.setattr(
+        watch, 'control_output', lambda results, _: outputs.append(results)
+    )
+    cli_args = Namespace(mode='pep', output=None)
+    tables = iter((
+        [('Статус', 'Количество'), ('Active', 1)],
+        [('Статус', 'Количество'), ('Active', 1)],
+        [('Статус', 'Количество'), ('Active', 2)],
+    ))
+    for _ in range(3):
+        watch.watch_once(None, cli_args, lambda *_: next(tables))
+    assert outputs == [
+        [(watch.CHANGE_COLUMN, 'Статус', 'Количество'),
+         (watch.CHANGE_ADDED, 'Active', 1)],
+        [(watch.CHANGE_COLUMN, 'Статус', 'Количество'),
+         (watch.CHANGE_CHANGED, 'Active', 2)],
+    ], 'Режим наблюдения не должен выводить результаты без изменений'
+
+
+def test_watch_once_keeps_snapshot_when_output_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, 'BASE_DIR', tmp_path)
+    outputs = []
+
+    def broken_output(results, cli_args):
+        if not outputs:
+            outputs.append(None)
+            raise ValueError('output')
+        outputs.append((cli_args.mode, results))
+
+    monkeypatch.setattr(watch, 'control_output', broken_output)
+    cli_args = Namespace(mode='pep', output='sqlite')
+    table = [('Номер', 'Статус в карточке'), (8, 'Active')]
+    try:
+        watch.watch_once(None, cli_args, lambda *_: table)
+    except ValueError:
+        pass
+    watch.watch_once(None, cli_args, lambda *_: table)
+    assert outputs[1:] == [(
+        'pep_changes',
+        [(watch.CHANGE_COLUMN, 'Номер', 'Статус в карточке'),
+         (watch.CHANGE_ADDED, 8, 'Active')],
+    )], (
+        'Изменения, которые не удалось вывести, должны выводиться при '
+        'следующем запуске в таблицу `<mode>_changes`'
+    )
+
+
+def test_watch_once_ignores_partial_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, 'BASE_DIR', tmp_path)
+    outputs = []
+    monkeypatch.setattr(
+        watch, 'control_output', lambda results, _: outputs.append(results)
+    )
+    cli_args = Namespace(mode='pep', output=None)
+    header = ('Номер', 'Статус в карточке')
+    tables = iter((
+        [header, (8, 'Active'), (20, 'Active')],
+        [header, (8, 'Final'), (watch.PARTIAL_RESULT, 'лимит')],
+        [header, (8, 'Final'), (20, 'Active')],
+    ))
+    for _ in range(3):
+        watch.watch_once(None, cli_args, lambda *_: next(tables))
+    assert outputs[1:] == [
+        [(watch.CHANGE_COLUMN, *header), (watch.CHANGE_CHANGED, 8, 'Final')],
+    ], (
+        'Строка-отметка о частичных результатах и необработанные строки '
+        'не должны выводиться как изменения'
+    )